@@ -1,5 +1,11 @@
 #!/usr/bin/env python3
-"""Main entry point for the Sentiment Trading System."""
+"""Main entry point for the Sentiment Trading System.
+
+For production use, serve the app through gunicorn so requests are handled
+concurrently instead of serialized by the Werkzeug dev server:
+
+    gunicorn -k gevent -w 4 --worker-connections 1000 -b 0.0.0.0:5000 run:app
+"""
 
 import sys
 import os
@@ -7,9 +13,14 @@ import os
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+# Shared numba cache location so backtest worker processes reuse the
+# compiled kernels instead of re-JITting on startup
+os.environ.setdefault('NUMBA_CACHE_DIR',
+                      os.path.join(os.path.dirname(__file__), '.numba_cache'))
+
 from api.app import app
 
 if __name__ == '__main__':
-    # Run Flask app
-    app.run(debug=True, host='0.0.0.0', port=5000)
-
+    # Development server only; use gunicorn in production (see module docstring)
+    debug = os.getenv('FLASK_DEBUG', '1') == '1'
+    app.run(debug=debug, host='0.0.0.0', port=int(os.getenv('PORT', 5000)))
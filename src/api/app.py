@@ -1,77 +1,64 @@
 """Flask application for sentiment trading system API."""
 
+import functools
 import os
+import orjson
 import yaml
+from cachetools import TTLCache
 from flask import Flask, jsonify, request, send_from_directory
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+import atexit
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from types import SimpleNamespace
 import sys
 
-# Add src directory to path for imports
+# Add src directory to path for imports (run.py already does this when the
+# app is served through it; avoid inserting the path twice)
 src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, src_dir)
-
-from database.db_manager import DatabaseManager
-from market_data.yahoo_finance import MarketDataFetcher
-from sentiment.gpt_analyzer import GPTSentimentAnalyzer
-from strategy.trading_strategy import SentimentTradingStrategy
-from strategy.backtesting_engine import BacktestingEngine
-from data_collection.reddit_scraper import RedditScraper
-from data_collection.twitter_scraper import TwitterScraper
-from data_collection.news_scraper import NewsScraper
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
 
 # Load environment variables
 load_dotenv()
 
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    Serializes responses in C instead of the stdlib encoder, and handles
+    numpy scalars/arrays and datetimes natively — the chart and history
+    endpoints emit hundreds of rows of both per request.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY,
+                            default=str).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__, static_folder='../../frontend/static', template_folder='../../frontend/templates')
+app.json = ORJSONProvider(app)
 CORS(app)
 
-# Load configuration
+# Load configuration. Prefer libyaml's C loader (~20x faster than the
+# pure-Python one); this runs on every worker fork.
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config', 'config.yaml')
 with open(config_path, 'r') as f:
-    config = yaml.safe_load(f)
-
-# Initialize components
-db_manager = DatabaseManager()
+    config = yaml.load(f, Loader=_YamlLoader)
 
-# Initialize market data fetcher
-market_fetcher = MarketDataFetcher()
-
-# Initialize sentiment analyzer with rate limiting
-openai_api_key = os.getenv('OPENAI_API_KEY') or config.get('api_keys', {}).get('openai_api_key', '')
 rate_limit_config = config.get('rate_limiting', {})
-sentiment_analyzer = GPTSentimentAnalyzer(
-    openai_api_key, 
-    model='gpt-4o-mini',
-    max_daily_cost=rate_limit_config.get('max_daily_cost_usd', 10.0),
-    max_texts_per_request=rate_limit_config.get('max_texts_per_sentiment_request', 20)
-)
-
-# Initialize scrapers
-reddit_client_id = os.getenv('REDDIT_CLIENT_ID') or config.get('api_keys', {}).get('reddit_client_id', '')
-reddit_secret = os.getenv('REDDIT_SECRET') or config.get('api_keys', {}).get('reddit_secret', '')
-twitter_bearer = os.getenv('TWITTER_BEARER_TOKEN') or config.get('api_keys', {}).get('twitter_bearer_token', '')
-
-reddit_scraper = RedditScraper(reddit_client_id, reddit_secret, 'sentiment-trading-bot/1.0') if reddit_client_id else None
-twitter_scraper = TwitterScraper(bearer_token=twitter_bearer) if twitter_bearer else None
-news_scraper = NewsScraper()
-
-# Initialize strategy
-strategy_config = config.get('strategy', {})
-trading_strategy = SentimentTradingStrategy(
-    sentiment_weight=strategy_config.get('sentiment_weight', 0.6),
-    technical_weight=strategy_config.get('technical_weight', 0.4),
-    buy_threshold=strategy_config.get('buy_threshold', 0.6),
-    sell_threshold=strategy_config.get('sell_threshold', -0.6)
-)
-
-# Initialize backtesting engine
-backtest_config = config.get('backtesting', {})
-backtesting_engine = BacktestingEngine(
-    initial_capital=backtest_config.get('initial_capital', 100000),
-    transaction_cost=backtest_config.get('transaction_cost', 0.001)
-)
 
 
 @app.route('/')
@@ -80,106 +67,253 @@ def index():
     return send_from_directory(app.template_folder, 'index.html')
 
 
+class SignalBuffer:
+    """Buffers trading signals and flushes them to the database in batches.
+
+    Under concurrent load, per-request single-row INSERTs pay a commit per
+    signal. Signals are queued here and drained by a daemon thread every
+    `interval` seconds (or immediately once `max_batch` are pending), so
+    the commit cost is amortized across the batch.
+    """
+
+    def __init__(self, database_manager, max_batch: int = 100, interval: float = 1.0):
+        self._db = database_manager
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._max_batch = max_batch
+        self._interval = interval
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def add(self, signal: dict):
+        """Queue a signal for the next flush."""
+        with self._lock:
+            self._queue.append(signal)
+            flush_now = len(self._queue) >= self._max_batch
+        if flush_now:
+            self.flush()
+
+    def flush(self):
+        """Write all pending signals in one transaction."""
+        with self._lock:
+            if not self._queue:
+                return
+            batch = list(self._queue)
+            self._queue.clear()
+        self._db.save_trading_signals_batch(batch)
+
+    def _run(self):
+        while True:
+            time.sleep(self._interval)
+            self.flush()
+
+
+@functools.lru_cache(maxsize=1)
+def _components() -> SimpleNamespace:
+    """Build and cache the heavyweight application components.
+
+    Importing pandas, yfinance, openai, praw, tweepy, feedparser and bs4 at
+    module scope makes every worker fork pay several seconds of cold-start
+    even for routes that never touch them. Deferring the imports here (Python
+    caches them in sys.modules) and memoizing the constructed objects keeps
+    app.py import time to Flask + stdlib.
+
+    Returns:
+        Namespace with db, market, sentiment, scrapers, strategy, backtest,
+        and the signal write buffer
+    """
+    from database.db_manager import DatabaseManager
+    from market_data.yahoo_finance import MarketDataFetcher
+    from sentiment.gpt_analyzer import GPTSentimentAnalyzer
+    from strategy.trading_strategy import SentimentTradingStrategy
+    from strategy.backtesting_engine import BacktestingEngine
+    from data_collection.reddit_scraper import RedditScraper
+    from data_collection.twitter_scraper import TwitterScraper
+    from data_collection.news_scraper import NewsScraper
+
+    db_manager = DatabaseManager()
+
+    openai_api_key = os.getenv('OPENAI_API_KEY') or config.get('api_keys', {}).get('openai_api_key', '')
+    sentiment_analyzer = GPTSentimentAnalyzer(
+        openai_api_key,
+        model='gpt-4o-mini',
+        max_daily_cost=rate_limit_config.get('max_daily_cost_usd', 10.0),
+        max_texts_per_request=rate_limit_config.get('max_texts_per_sentiment_request', 20)
+    )
+
+    reddit_client_id = os.getenv('REDDIT_CLIENT_ID') or config.get('api_keys', {}).get('reddit_client_id', '')
+    reddit_secret = os.getenv('REDDIT_SECRET') or config.get('api_keys', {}).get('reddit_secret', '')
+    twitter_bearer = os.getenv('TWITTER_BEARER_TOKEN') or config.get('api_keys', {}).get('twitter_bearer_token', '')
+
+    strategy_config = config.get('strategy', {})
+    backtest_config = config.get('backtesting', {})
+
+    return SimpleNamespace(
+        db=db_manager,
+        market=MarketDataFetcher(),
+        sentiment=sentiment_analyzer,
+        reddit=RedditScraper(reddit_client_id, reddit_secret, 'sentiment-trading-bot/1.0') if reddit_client_id else None,
+        twitter=TwitterScraper(bearer_token=twitter_bearer) if twitter_bearer else None,
+        news=NewsScraper(),
+        strategy=SentimentTradingStrategy(
+            sentiment_weight=strategy_config.get('sentiment_weight', 0.6),
+            technical_weight=strategy_config.get('technical_weight', 0.4),
+            buy_threshold=strategy_config.get('buy_threshold', 0.6),
+            sell_threshold=strategy_config.get('sell_threshold', -0.6)
+        ),
+        backtest=BacktestingEngine(
+            initial_capital=backtest_config.get('initial_capital', 100000),
+            transaction_cost=backtest_config.get('transaction_cost', 0.001)
+        ),
+        signals=SignalBuffer(db_manager)
+    )
+
+
+# Cache full sentiment payloads briefly so repeat requests for a hot ticker
+# skip the scrape + GPT pipeline entirely
+sentiment_cache = TTLCache(maxsize=256, ttl=60)
+
+
+def _compute_sentiment(ticker: str) -> dict:
+    """Collect texts, run sentiment analysis, and build the sentiment payload.
+
+    Shared by /api/sentiment and /api/recommendation so the recommendation
+    endpoint reuses the Python dict directly instead of round-tripping
+    through a serialized HTTP response.
+
+    Args:
+        ticker: Uppercased stock ticker symbol
+
+    Returns:
+        Dictionary with aggregated sentiment, recent mentions, and history
+    """
+    cached_payload = sentiment_cache.get(ticker)
+    if cached_payload is not None:
+        return cached_payload
+
+    c = _components()
+
+    # Collect sentiment data from various sources. The three scrapes are
+    # independent network I/O, so run them concurrently: latency becomes
+    # max(Reddit, Twitter, News) instead of their sum.
+    texts_for_analysis = []
+    sources = []
+
+    reddit_posts, twitter_tweets, news_articles = [], [], []
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {}
+        if c.reddit:
+            futures['reddit'] = executor.submit(
+                c.reddit.get_posts_for_ticker, ticker, 20)
+        if c.twitter:
+            futures['twitter'] = executor.submit(
+                c.twitter.get_tweets_for_ticker, ticker, 20)
+        futures['news'] = executor.submit(
+            c.news.search_news_by_ticker, ticker, limit_per_source=10)
+
+        results = {}
+        for source_name, future in futures.items():
+            try:
+                results[source_name] = future.result()
+            except Exception as e:
+                print(f"Error scraping {source_name}: {e}")
+                results[source_name] = []
+
+        reddit_posts = results.get('reddit', [])
+        twitter_tweets = results.get('twitter', [])
+        news_articles = results.get('news', [])
+
+    # GPT cost and latency scale with input tokens; the lede carries the
+    # sentiment, so cap each text at 500 chars before analysis
+    for post in reddit_posts:
+        text = (post.get('title', '') + ' ' + post.get('content', ''))[:500]
+        if text.strip():
+            texts_for_analysis.append(text)
+            sources.append({
+                'source': 'reddit',
+                'text': text[:200] + '...' if len(text) > 200 else text,
+                'metadata': {
+                    'subreddit': post.get('subreddit'),
+                    'upvotes': post.get('upvotes', 0),
+                    'url': post.get('url')
+                }
+            })
+
+    for tweet in twitter_tweets:
+        text = tweet.get('text', '')
+        if text.strip():
+            texts_for_analysis.append(text)
+            sources.append({
+                'source': 'twitter',
+                'text': text[:200] + '...' if len(text) > 200 else text,
+                'metadata': {
+                    'likes': tweet.get('likes', 0),
+                    'retweets': tweet.get('retweets', 0),
+                    'author': tweet.get('author')
+                }
+            })
+
+    for article in news_articles[:20]:
+        text = (article.get('headline', '') + ' ' + article.get('article_text', ''))[:500]
+        if text.strip():
+            texts_for_analysis.append(text)
+            sources.append({
+                'source': 'news',
+                'text': text[:200] + '...' if len(text) > 200 else text,
+                'metadata': {
+                    'headline': article.get('headline'),
+                    'url': article.get('url'),
+                    'source': article.get('source')
+                }
+            })
+
+    # Analyze sentiment (limit texts to prevent excessive costs)
+    max_texts = rate_limit_config.get('max_texts_per_sentiment_request', 20)
+    texts_for_analysis = texts_for_analysis[:max_texts]
+
+    if texts_for_analysis:
+        # Analyze all texts in a single batch: one RPM slot, one round-trip
+        sentiment_results = c.sentiment.batch_analyze(
+            texts_for_analysis,
+            ticker=ticker,
+            batch_size=len(texts_for_analysis),
+            delay=0
+        )
+        aggregated = c.sentiment.aggregate_sentiment(sentiment_results)
+    else:
+        aggregated = c.sentiment.aggregate_sentiment([])
+
+    # Get historical sentiment from database
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=30)
+    historical_sentiment = c.db.get_historical_sentiment(ticker, start_date, end_date)
+
+    payload = {
+        'ticker': ticker,
+        'aggregated_sentiment': aggregated,
+        'recent_mentions': sources[:10],  # Return top 10
+        'historical_sentiment': historical_sentiment.to_dict('records') if not historical_sentiment.empty else []
+    }
+    sentiment_cache[ticker] = payload
+    return payload
+
+
 @app.route('/api/sentiment/<ticker>')
 def get_sentiment(ticker):
     """Get current sentiment for a ticker.
-    
+
     Returns:
         JSON with aggregated sentiment, recent mentions, and charts data
     """
     try:
         ticker = ticker.upper()
-        
-        # Collect sentiment data from various sources
-        texts_for_analysis = []
-        sources = []
-        
-        # Scrape Reddit
-        if reddit_scraper:
-            try:
-                reddit_posts = reddit_scraper.get_posts_for_ticker(ticker, limit=20)
-                for post in reddit_posts:
-                    text = post.get('title', '') + ' ' + post.get('content', '')
-                    if text.strip():
-                        texts_for_analysis.append(text)
-                        sources.append({
-                            'source': 'reddit',
-                            'text': text[:200] + '...' if len(text) > 200 else text,
-                            'metadata': {
-                                'subreddit': post.get('subreddit'),
-                                'upvotes': post.get('upvotes', 0),
-                                'url': post.get('url')
-                            }
-                        })
-            except Exception as e:
-                print(f"Error scraping Reddit: {e}")
-        
-        # Scrape Twitter
-        if twitter_scraper:
-            try:
-                twitter_tweets = twitter_scraper.get_tweets_for_ticker(ticker, max_results=20)
-                for tweet in twitter_tweets:
-                    text = tweet.get('text', '')
-                    if text.strip():
-                        texts_for_analysis.append(text)
-                        sources.append({
-                            'source': 'twitter',
-                            'text': text[:200] + '...' if len(text) > 200 else text,
-                            'metadata': {
-                                'likes': tweet.get('likes', 0),
-                                'retweets': tweet.get('retweets', 0),
-                                'author': tweet.get('author')
-                            }
-                        })
-            except Exception as e:
-                print(f"Error scraping Twitter: {e}")
-        
-        # Scrape News
-        try:
-            news_articles = news_scraper.search_news_by_ticker(ticker, limit_per_source=10)
-            for article in news_articles[:20]:
-                text = article.get('headline', '') + ' ' + article.get('article_text', '')
-                if text.strip():
-                    texts_for_analysis.append(text)
-                    sources.append({
-                        'source': 'news',
-                        'text': text[:200] + '...' if len(text) > 200 else text,
-                        'metadata': {
-                            'headline': article.get('headline'),
-                            'url': article.get('url'),
-                            'source': article.get('source')
-                        }
-                    })
-        except Exception as e:
-            print(f"Error scraping news: {e}")
-        
-        # Analyze sentiment (limit texts to prevent excessive costs)
-        max_texts = rate_limit_config.get('max_texts_per_sentiment_request', 20)
-        texts_for_analysis = texts_for_analysis[:max_texts]
-        
-        if texts_for_analysis:
-            sentiment_results = sentiment_analyzer.batch_analyze(
-                texts_for_analysis, 
-                ticker=ticker, 
-                batch_size=5,
-                delay=0.2  # Increased delay to respect rate limits
-            )
-            aggregated = sentiment_analyzer.aggregate_sentiment(sentiment_results)
-        else:
-            aggregated = sentiment_analyzer.aggregate_sentiment([])
-        
-        # Get historical sentiment from database
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=30)
-        historical_sentiment = db_manager.get_historical_sentiment(ticker, start_date, end_date)
-        
-        return jsonify({
-            'ticker': ticker,
-            'aggregated_sentiment': aggregated,
-            'recent_mentions': sources[:10],  # Return top 10
-            'historical_sentiment': historical_sentiment.to_dict('records') if not historical_sentiment.empty else []
-        })
-    
+
+        cache_state = 'HIT' if ticker in sentiment_cache else 'MISS'
+        response = jsonify(_compute_sentiment(ticker))
+        response.headers['X-Cache'] = cache_state
+        return response
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -194,23 +328,23 @@ def get_recommendation(ticker):
     try:
         ticker = ticker.upper()
         
-        # Get sentiment data
-        sentiment_response = get_sentiment(ticker)
-        sentiment_data = sentiment_response.get_json() if hasattr(sentiment_response, 'get_json') else {}
+        # Get sentiment data (direct call, no JSON round-trip)
+        sentiment_data = _compute_sentiment(ticker)
         aggregated_sentiment = sentiment_data.get('aggregated_sentiment', {})
         
         # Get market data and indicators
-        indicators = market_fetcher.get_market_indicators(ticker)
+        c = _components()
+        indicators = c.market.get_market_indicators(ticker)
         market_data = {
             'indicators': indicators,
             'current_price': indicators.get('current_price')
         }
         
         # Generate signal
-        signal = trading_strategy.generate_signal(ticker, aggregated_sentiment, market_data)
+        signal = c.strategy.generate_signal(ticker, aggregated_sentiment, market_data)
         
-        # Save signal to database
-        db_manager.save_trading_signal({
+        # Queue signal for batched database write
+        c.signals.add({
             'ticker': ticker,
             'signal_type': signal['signal_type'],
             'confidence': signal['confidence'],
@@ -252,9 +386,12 @@ def run_backtest():
         start_date = datetime.fromisoformat(data.get('start_date', '2023-01-01'))
         end_date = datetime.fromisoformat(data.get('end_date', '2024-01-01'))
         
+        c = _components()
+
         # Create strategy with custom parameters if provided
         strategy_params = data.get('strategy_params', {})
         if strategy_params:
+            from strategy.trading_strategy import SentimentTradingStrategy
             backtest_strategy = SentimentTradingStrategy(
                 sentiment_weight=strategy_params.get('sentiment_weight', 0.6),
                 technical_weight=strategy_params.get('technical_weight', 0.4),
@@ -262,25 +399,25 @@ def run_backtest():
                 sell_threshold=strategy_params.get('sell_threshold', -0.6)
             )
         else:
-            backtest_strategy = trading_strategy
+            backtest_strategy = c.strategy
         
         # Run backtest
-        result = backtesting_engine.run_backtest(
+        result = c.backtest.run_backtest(
             backtest_strategy,
             ticker,
             start_date,
             end_date,
-            db_manager=db_manager
+            db_manager=c.db
         )
         
         # Save result to database
         if 'error' not in result:
-            db_manager.save_backtest_result({
+            c.db.save_backtest_result({
                 'strategy_name': 'Sentiment Trading Strategy',
                 'ticker': ticker,
                 'start_date': start_date,
                 'end_date': end_date,
-                'initial_capital': backtesting_engine.initial_capital,
+                'initial_capital': c.backtest.initial_capital,
                 'final_value': result.get('final_value'),
                 'total_return': result.get('total_return'),
                 'sharpe_ratio': result.get('sharpe_ratio'),
@@ -306,16 +443,26 @@ def get_charts_data(ticker):
     try:
         ticker = ticker.upper()
         
+        c = _components()
+
         # Get market data
-        market_df = market_fetcher.get_historical_data(ticker, period='1y')
+        market_df = c.market.get_historical_data(ticker, period='1y')
         
-        # Get indicators
-        indicators_data = market_fetcher.get_market_indicators(ticker, period='1y')
+        # Get indicators with the full history for the MA chart overlays
+        indicators_data = c.market.get_market_indicators(
+            ticker, period='1y', include_history=True)
+
+        # full_data arrives as a DataFrame; the frontend expects a JSON
+        # array of per-row records
+        full_df = indicators_data.pop('full_data', None)
+        indicators_data['full_data'] = (
+            full_df.to_dict('records')
+            if full_df is not None and not full_df.empty else [])
         
         # Get historical sentiment
         end_date = datetime.now()
         start_date = end_date - timedelta(days=365)
-        sentiment_df = db_manager.get_historical_sentiment(ticker, start_date, end_date)
+        sentiment_df = c.db.get_historical_sentiment(ticker, start_date, end_date)
         
         # Format data for charts
         chart_data = {
@@ -339,7 +486,7 @@ def get_usage_stats():
         JSON with usage stats and costs
     """
     try:
-        stats = sentiment_analyzer.get_usage_stats()
+        stats = _components().sentiment.get_usage_stats()
         return jsonify(stats)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -365,7 +512,7 @@ def get_historical_sentiment(ticker):
             end_date = datetime.now()
             start_date = end_date - timedelta(days=30)
         
-        sentiment_df = db_manager.get_historical_sentiment(ticker, start_date, end_date)
+        sentiment_df = _components().db.get_historical_sentiment(ticker, start_date, end_date)
         
         return jsonify({
             'ticker': ticker,
@@ -379,5 +526,6 @@ def get_historical_sentiment(ticker):
 
 
 if __name__ == '__main__':
+    # Development server only; use gunicorn in production (see run.py)
     app.run(debug=True, port=5000)
 
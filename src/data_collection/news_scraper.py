@@ -1,23 +1,87 @@
 """News scraper for collecting stock sentiment from finance news sources."""
 
+import asyncio
+import concurrent.futures
+import time
+import aiohttp
 import feedparser
 from bs4 import BeautifulSoup
-import requests
-from typing import List, Dict, Optional
+import soupsieve
+from cachetools import TTLCache
+import httpx
+from typing import Callable, List, Dict, Optional
 from datetime import datetime
 import re
 
+# Pattern for $TICKER format, compiled once at import
+_DOLLAR_TICKER_RE = re.compile(r'\$([A-Z]{1,5})\b')
+
+# Common stock tickers (major ones), folded into one alternation so the text
+# is scanned in a single pass instead of once per ticker
+_COMMON_TICKERS = ('AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'META', 'NVDA', 'NFLX',
+                   'SPY', 'QQQ', 'DIA', 'VIX')
+_COMMON_TICKER_RE = re.compile(r'\b(' + '|'.join(_COMMON_TICKERS) + r')\b')
+
 
 class NewsScraper:
     """Scrapes finance news from various sources."""
-    
-    def __init__(self):
-        """Initialize news scraper."""
-        self.session = requests.Session()
-        self.session.headers.update({
+
+    # Shared process pool for feedparser.parse — the parse is pure-Python and
+    # CPU-bound on large feeds, so running it in worker processes keeps the
+    # event loop fetching while parsing proceeds in parallel off the GIL
+    _parse_pool = None
+
+    # Article content selectors, compiled once instead of re-parsed into CSS
+    # matchers on every soup.select_one call. The two [class*=] selectors are
+    # fused into one compound selector so the full-tree scan happens at most
+    # once; they stay last because they are the most expensive to match.
+    _SELECTORS = tuple(soupsieve.compile(sel) for sel in (
+        'article',
+        '.article-body',
+        '.article-content',
+        '.post-content',
+        'main',
+        '#article-body',
+        '[class*="article"], [class*="content"]'
+    ))
+
+    @classmethod
+    def _get_parse_pool(cls) -> concurrent.futures.ProcessPoolExecutor:
+        if cls._parse_pool is None:
+            cls._parse_pool = concurrent.futures.ProcessPoolExecutor(max_workers=2)
+        return cls._parse_pool
+
+    def __init__(self, max_concurrent_fetches: int = 20):
+        """Initialize news scraper.
+
+        Args:
+            max_concurrent_fetches: Maximum number of article downloads in flight
+        """
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        
+        }
+        # HTTP/2 multiplexes many article fetches over one TCP/TLS connection
+        # per news domain, avoiding repeated handshakes
+        self.session = httpx.Client(
+            http2=True,
+            headers=self.headers,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+            timeout=10.0,
+            follow_redirects=True
+        )
+        self.max_concurrent_fetches = max_concurrent_fetches
+
+        # Article content is a pure function of URL; cache it for 15 minutes
+        # so repeated ticker lookups don't re-download the same HTML
+        self._article_cache = TTLCache(maxsize=2048, ttl=900)
+        # Short-lived cache of search results keyed by query parameters
+        self._search_cache = {}
+        self._search_cache_ttl = 60
+
+        # Conditional-GET state per source: ETag/Last-Modified validators plus
+        # the last parsed entries, so a 304 costs zero body bytes
+        self._feed_meta = {}
+
         # RSS feed URLs for finance news sources
         self.rss_feeds = {
             'reuters': 'https://www.reutersagency.com/feed/?best-topics=business-finance&post_type=best',
@@ -26,197 +90,426 @@ class NewsScraper:
             'yahoo_finance': 'https://finance.yahoo.com/news/rssindex',
             'marketwatch': 'http://feeds.marketwatch.com/marketwatch/topstories/'
         }
-    
-    def scrape_finance_news(self, sources: Optional[List[str]] = None, 
-                           limit_per_source: int = 20) -> List[Dict]:
+
+    def scrape_finance_news(self, sources: Optional[List[str]] = None,
+                           limit_per_source: int = 20,
+                           fetch_filter: Optional[Callable[[str], bool]] = None) -> List[Dict]:
         """Scrape finance news from specified sources.
-        
+
+        All feeds and article bodies are downloaded concurrently, so wall time
+        is bounded by the slowest fetch rather than the sum of all fetches.
+
         Args:
             sources: List of news sources to scrape (default: all available)
             limit_per_source: Maximum number of articles per source
-            
+            fetch_filter: Optional predicate over "headline summary" text; when
+                it returns False the expensive full-article download is skipped
+                and the entry keeps its feed summary
+
         Returns:
             List of dictionaries with news article data
         """
         if sources is None:
             sources = list(self.rss_feeds.keys())
-        
-        all_articles = []
-        
+
+        known_sources = []
         for source in sources:
             if source not in self.rss_feeds:
                 print(f"Unknown source: {source}")
                 continue
-            
-            try:
-                articles = self._scrape_rss_feed(self.rss_feeds[source], source, limit_per_source)
-                all_articles.extend(articles)
-            except Exception as e:
-                print(f"Error scraping {source}: {e}")
-        
+            known_sources.append(source)
+
+        if not known_sources:
+            return []
+
+        return asyncio.run(self._ascrape(known_sources, limit_per_source, fetch_filter))
+
+    async def _ascrape(self, sources: List[str], limit_per_source: int,
+                       fetch_filter: Optional[Callable[[str], bool]] = None) -> List[Dict]:
+        """Scrape all feeds concurrently over a shared HTTP connection pool.
+
+        Args:
+            sources: List of known news sources to scrape
+            limit_per_source: Maximum number of articles per source
+            fetch_filter: Optional predicate gating full-article downloads
+
+        Returns:
+            List of dictionaries with news article data
+        """
+        connector = aiohttp.TCPConnector(limit=64, limit_per_host=8)
+        timeout = aiohttp.ClientTimeout(total=10)
+        semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers=self.headers) as session:
+            tasks = [
+                self._ascrape_rss_feed(session, semaphore, self.rss_feeds[source],
+                                       source, limit_per_source, fetch_filter)
+                for source in sources
+            ]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        all_articles = []
+        for source, result in zip(sources, results):
+            if isinstance(result, BaseException):
+                print(f"Error scraping {source}: {result}")
+            else:
+                all_articles.extend(result)
+
         return all_articles
-    
-    def _scrape_rss_feed(self, feed_url: str, source: str, limit: int = 20) -> List[Dict]:
-        """Scrape articles from an RSS feed.
-        
+
+    async def _afetch(self, session: aiohttp.ClientSession, url: str) -> str:
+        """Fetch a URL asynchronously and return its body text.
+
+        Args:
+            session: Shared aiohttp client session
+            url: URL to fetch
+
+        Returns:
+            Response body as text
+        """
+        async with session.get(url) as response:
+            response.raise_for_status()
+            return await response.text(errors='replace')
+
+    async def _afetch_bytes(self, session: aiohttp.ClientSession, url: str) -> bytes:
+        """Fetch a URL asynchronously and return its raw body.
+
+        Args:
+            session: Shared aiohttp client session
+            url: URL to fetch
+
+        Returns:
+            Response body as bytes
+        """
+        async with session.get(url) as response:
+            response.raise_for_status()
+            return await response.read()
+
+    async def _ascrape_rss_feed(self, session: aiohttp.ClientSession,
+                                semaphore: asyncio.Semaphore, feed_url: str,
+                                source: str, limit: int = 20,
+                                fetch_filter: Optional[Callable[[str], bool]] = None) -> List[Dict]:
+        """Scrape articles from an RSS feed, fetching article bodies concurrently.
+
         Args:
+            session: Shared aiohttp client session
+            semaphore: Semaphore bounding concurrent article downloads
             feed_url: URL of the RSS feed
             source: Name of the news source
             limit: Maximum number of articles to retrieve
-            
+            fetch_filter: Optional predicate gating full-article downloads
+
         Returns:
             List of dictionaries with article data
         """
+        loop = asyncio.get_running_loop()
         try:
-            feed = feedparser.parse(feed_url)
+            # Download the feed over the shared connection pool (keep-alive,
+            # our User-Agent) rather than letting feedparser do its own
+            # blocking urllib fetch. Send the validators from the previous
+            # fetch so an unchanged feed answers 304 with no body at all.
+            meta = self._feed_meta.get(source, {})
+            conditional_headers = {}
+            if meta.get('etag'):
+                conditional_headers['If-None-Match'] = meta['etag']
+            if meta.get('modified'):
+                conditional_headers['If-Modified-Since'] = meta['modified']
+
+            async with session.get(feed_url, headers=conditional_headers) as response:
+                if response.status == 304 and meta.get('entries') is not None:
+                    # Feed unchanged; reuse the previously parsed entries
+                    # (article bodies are served from the article cache)
+                    feed_bytes = None
+                else:
+                    response.raise_for_status()
+                    feed_bytes = await response.read()
+                    meta = {
+                        'etag': response.headers.get('ETag'),
+                        'modified': response.headers.get('Last-Modified')
+                    }
+
+            if feed_bytes is None:
+                entries = meta['entries'][:limit]
+            else:
+                feed = await loop.run_in_executor(self._get_parse_pool(),
+                                                  feedparser.parse, feed_bytes)
+                meta['entries'] = feed.entries
+                self._feed_meta[source] = meta
+                entries = feed.entries[:limit]
+
+            # Fetch article bodies concurrently under the semaphore. Entries
+            # whose headline+summary already fail the filter (e.g. no mention
+            # of the target ticker) skip the download entirely — the fetch and
+            # parse are the most expensive steps and most articles are
+            # irrelevant to any given ticker.
+            async def fetch_content(entry):
+                if fetch_filter is not None and not fetch_filter(self._entry_preview(entry)):
+                    return ''
+                return await self._afetch_article_content(session, semaphore, entry)
+
+            full_texts = await asyncio.gather(
+                *[fetch_content(entry) for entry in entries]
+            )
+
             articles = []
-            
-            for entry in feed.entries[:limit]:
-                # Parse published date
-                published = None
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    published = datetime(*entry.published_parsed[:6])
-                elif hasattr(entry, 'published'):
-                    try:
-                        published = datetime.strptime(entry.published, '%a, %d %b %Y %H:%M:%S %z')
-                    except:
-                        published = datetime.utcnow()
-                
-                # Extract article text
-                article_text = ''
-                if hasattr(entry, 'summary'):
-                    article_text = entry.summary
-                elif hasattr(entry, 'description'):
-                    article_text = entry.description
-                
-                # Try to fetch full article content
-                full_text = article_text
-                if hasattr(entry, 'link'):
-                    try:
-                        full_text = self._fetch_article_content(entry.link)
-                    except:
-                        pass  # Use summary if full content fetch fails
-                
-                article_data = {
-                    'headline': entry.title if hasattr(entry, 'title') else '',
-                    'article_text': full_text or article_text,
-                    'summary': article_text,
-                    'timestamp': published or datetime.utcnow(),
-                    'url': entry.link if hasattr(entry, 'link') else '',
-                    'source': source,
-                    'stock_mentions': self._extract_stock_mentions(
-                        entry.title + ' ' + full_text
-                    )
-                }
-                articles.append(article_data)
-            
+            for entry, full_text in zip(entries, full_texts):
+                articles.append(self._build_article(entry, full_text, source))
+
             return articles
         except Exception as e:
             print(f"Error parsing RSS feed {feed_url}: {e}")
             return []
-    
+
+    @staticmethod
+    def _entry_preview(entry) -> str:
+        """Build the cheap headline+summary preview text for a feed entry.
+
+        Args:
+            entry: Parsed RSS feed entry
+
+        Returns:
+            Concatenated headline and summary/description text
+        """
+        # FeedParserDict raises AttributeError from __getattr__, so hasattr
+        # costs a try/except per probe; .get is a plain dict lookup
+        summary = entry.get('summary') or entry.get('description') or ''
+        return entry.get('title', '') + ' ' + summary
+
+    async def _afetch_article_content(self, session: aiohttp.ClientSession,
+                                      semaphore: asyncio.Semaphore, entry) -> str:
+        """Fetch and extract full article content for a feed entry.
+
+        Args:
+            session: Shared aiohttp client session
+            semaphore: Semaphore bounding concurrent article downloads
+            entry: Parsed RSS feed entry
+
+        Returns:
+            Article text content, or empty string if unavailable
+        """
+        link = entry.get('link')
+        if not link:
+            return ''
+
+        cached = self._article_cache.get(link)
+        if cached is not None:
+            return cached
+
+        try:
+            async with semaphore:
+                html = await self._afetch(session, link)
+            # BeautifulSoup parsing is CPU-bound; run it off the event loop
+            loop = asyncio.get_running_loop()
+            content = await loop.run_in_executor(None, self._extract_article_text, html)
+            self._article_cache[link] = content
+            return content
+        except Exception:
+            return ''  # Use summary if full content fetch fails
+
+    def _build_article(self, entry, full_text: str, source: str) -> Dict:
+        """Build an article dictionary from a feed entry.
+
+        Args:
+            entry: Parsed RSS feed entry
+            full_text: Full article text (may be empty)
+            source: Name of the news source
+
+        Returns:
+            Dictionary with article data
+        """
+        # Parse published date (.get avoids FeedParserDict's exception-based
+        # hasattr probes — a plain dict lookup per field instead)
+        published = None
+        published_parsed = entry.get('published_parsed')
+        if published_parsed:
+            published = datetime(*published_parsed[:6])
+        elif entry.get('published'):
+            try:
+                published = datetime.strptime(entry.get('published'), '%a, %d %b %Y %H:%M:%S %z')
+            except:
+                published = datetime.utcnow()
+
+        # Extract article text
+        article_text = entry.get('summary') or entry.get('description') or ''
+
+        full_text = full_text or article_text
+        headline = entry.get('title', '')
+
+        # Uppercase headline+body exactly once at scrape time; ticker
+        # filtering and mention extraction reuse this instead of re-allocating
+        # multi-KB uppercased copies per lookup
+        text_upper = (headline + ' ' + full_text).upper()
+
+        return {
+            'headline': headline,
+            'article_text': full_text,
+            'summary': article_text,
+            'timestamp': published or datetime.utcnow(),
+            'url': entry.get('link', ''),
+            'source': source,
+            'stock_mentions': self._extract_stock_mentions(text_upper,
+                                                           already_upper=True),
+            '_text_upper': text_upper
+        }
+
     def _fetch_article_content(self, url: str) -> str:
-        """Fetch full article content from URL.
-        
+        """Fetch full article content from URL (synchronous fallback).
+
         Args:
             url: URL of the article
-            
+
         Returns:
             Article text content
         """
+        cached = self._article_cache.get(url)
+        if cached is not None:
+            return cached
+
         try:
-            response = self.session.get(url, timeout=10)
+            response = self.session.get(url)
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Try to find article content in common HTML tags
-            article_content = ''
-            
-            # Common article content selectors
-            selectors = [
-                'article',
-                '.article-body',
-                '.article-content',
-                '.post-content',
-                'main',
-                '#article-body',
-                '[class*="article"]',
-                '[class*="content"]'
-            ]
-            
-            for selector in selectors:
-                content = soup.select_one(selector)
-                if content:
-                    article_content = content.get_text(separator=' ', strip=True)
-                    if len(article_content) > 200:  # Minimum content length
-                        break
-            
-            # Fallback: get all paragraph text
-            if not article_content:
-                paragraphs = soup.find_all('p')
-                article_content = ' '.join([p.get_text(strip=True) for p in paragraphs])
-            
-            return article_content[:5000]  # Limit length
+            content = self._extract_article_text(response.content)
+            self._article_cache[url] = content
+            return content
         except Exception as e:
             print(f"Error fetching article content from {url}: {e}")
             return ''
-    
+
+    def _extract_article_text(self, html) -> str:
+        """Extract readable article text from an HTML document.
+
+        Args:
+            html: HTML document (str or bytes)
+
+        Returns:
+            Article text content
+        """
+        # lxml parses large article pages several times faster than the
+        # pure-Python html.parser
+        soup = BeautifulSoup(html, 'lxml')
+
+        # Remove script and style elements
+        for script in soup(["script", "style"]):
+            script.decompose()
+
+        # Try to find article content in common HTML tags
+        article_content = ''
+
+        for selector in self._SELECTORS:
+            content = selector.select_one(soup)
+            if content:
+                article_content = content.get_text(separator=' ', strip=True)
+                if len(article_content) > 200:  # Minimum content length
+                    break
+
+        # Fallback: get all paragraph text
+        if not article_content:
+            paragraphs = soup.find_all('p')
+            article_content = ' '.join([p.get_text(strip=True) for p in paragraphs])
+
+        return article_content[:5000]  # Limit length
+
     def search_news_by_ticker(self, ticker: str, sources: Optional[List[str]] = None,
                               limit_per_source: int = 10) -> List[Dict]:
         """Search news articles mentioning a specific ticker.
-        
+
         Args:
             ticker: Stock ticker symbol
             sources: Optional list of sources to search
             limit_per_source: Maximum articles per source
-            
+
         Returns:
             List of dictionaries with relevant articles
         """
-        all_articles = self.scrape_finance_news(sources=sources, limit_per_source=limit_per_source * 5)
-        
+        cache_key = (ticker.upper(), tuple(sorted(sources or [])), limit_per_source)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            expiry, articles = cached
+            if expiry > time.time():
+                return articles
+
+        ticker_upper = ticker.upper()
+
+        def mentions_ticker(preview: str) -> bool:
+            return ticker_upper in preview.upper()
+
+        all_articles = self.scrape_finance_news(sources=sources,
+                                                limit_per_source=limit_per_source * 5,
+                                                fetch_filter=mentions_ticker)
+
         # Filter articles that mention the ticker
         relevant_articles = []
-        ticker_upper = ticker.upper()
-        
+
         for article in all_articles:
-            text = article['headline'] + ' ' + article['article_text']
-            if ticker_upper in text.upper() or ticker in article.get('stock_mentions', []):
+            text_upper = article.get('_text_upper') or (
+                article['headline'] + ' ' + article['article_text']).upper()
+            if ticker_upper in text_upper or ticker in article.get('stock_mentions', []):
                 relevant_articles.append(article)
                 if len(relevant_articles) >= limit_per_source * len(sources or ['all']):
                     break
-        
+
+        self._search_cache[cache_key] = (time.time() + self._search_cache_ttl,
+                                         relevant_articles)
         return relevant_articles
-    
-    def _extract_stock_mentions(self, text: str) -> List[str]:
+
+    def search_news_by_tickers(self, tickers: List[str],
+                               sources: Optional[List[str]] = None,
+                               limit_per_source: int = 10) -> Dict[str, List[Dict]]:
+        """Search news articles for a whole watchlist in one scrape.
+
+        Instead of one substring scan per ticker per article (O(N*M)), the
+        watchlist is compiled into a single word-bounded alternation so each
+        article is scanned exactly once regardless of watchlist size.
+
+        Args:
+            tickers: List of stock ticker symbols to match
+            sources: Optional list of sources to search
+            limit_per_source: Maximum articles per ticker
+
+        Returns:
+            Dictionary mapping each ticker to its matching articles
+        """
+        watchlist = [t.upper() for t in tickers]
+        # Match "$AAPL" or bare "AAPL" in one pass over the text
+        pattern = re.compile(
+            r'\$?\b(' + '|'.join(re.escape(t) for t in watchlist) + r')\b'
+        )
+        limit = limit_per_source * len(sources or ['all'])
+
+        all_articles = self.scrape_finance_news(sources=sources,
+                                                limit_per_source=limit_per_source * 5)
+
+        matches = {ticker: [] for ticker in watchlist}
+        for article in all_articles:
+            text_upper = article.get('_text_upper') or (
+                article['headline'] + ' ' + article['article_text']).upper()
+            hits = set(pattern.findall(text_upper))
+            hits.update(t for t in article.get('stock_mentions', []) if t in matches)
+            for ticker in hits:
+                if ticker in matches and len(matches[ticker]) < limit:
+                    matches[ticker].append(article)
+
+        return matches
+
+    def _extract_stock_mentions(self, text: str, already_upper: bool = False) -> List[str]:
         """Extract stock ticker mentions from text.
-        
+
         Args:
             text: Text to search for stock mentions
-            
+            already_upper: Skip uppercasing when the caller already did it
+
         Returns:
             List of mentioned stock tickers
         """
-        # Pattern for $TICKER format
-        dollar_pattern = r'\$([A-Z]{1,5})\b'
-        
+        text_upper = text if already_upper else text.upper()
+
         tickers = set()
-        
+
         # Find $TICKER mentions
-        dollar_matches = re.findall(dollar_pattern, text.upper())
-        tickers.update(dollar_matches)
-        
-        # Common stock tickers (major ones)
-        common_tickers = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'META', 'NVDA', 'NFLX',
-                         'SPY', 'QQQ', 'DIA', 'VIX']
-        for ticker in common_tickers:
-            if ticker in text.upper():
-                tickers.add(ticker)
-        
-        return list(tickers)
+        tickers.update(_DOLLAR_TICKER_RE.findall(text_upper))
 
+        # Common stock tickers (major ones), all matched in one pass
+        tickers.update(_COMMON_TICKER_RE.findall(text_upper))
+
+        return list(tickers)
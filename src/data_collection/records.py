@@ -0,0 +1,48 @@
+"""Lightweight record types for scraped content."""
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+
+@dataclass(slots=True)
+class PostRecord:
+    """A scraped Reddit post.
+
+    A slotted dataclass instead of a ~9-key dict per post: roughly a third
+    of the memory and faster field access when batches run to thousands of
+    posts. The get/__getitem__ shims keep dict-style consumers (the API
+    layer, dedupe loops) working unchanged.
+    """
+    title: str = ''
+    content: str = ''
+    upvotes: int = 0
+    comments: int = 0
+    timestamp: Optional[datetime] = None
+    url: str = ''
+    author: str = 'unknown'
+    stock_mentions: Tuple[str, ...] = ()
+    subreddit: str = ''
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self) -> dict:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+def to_arrow(records: List[PostRecord]):
+    """Build a columnar (struct-of-arrays) Arrow table from post records.
+
+    Args:
+        records: Batch of PostRecord instances
+
+    Returns:
+        pyarrow.Table with one column per record field
+    """
+    import pyarrow as pa
+
+    return pa.Table.from_pylist([record.to_dict() for record in records])
@@ -1,13 +1,49 @@
 """Reddit scraper for collecting stock sentiment from Reddit posts."""
 
+import atexit
 import praw
-from typing import List, Dict, Optional
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Iterator, List, Dict, Optional
 from datetime import datetime
-import re
+
+from .dedup import BloomFilter
+from .records import PostRecord
+from .tickers import extract_stock_mentions
+
+# Shared HTTP session with a keep-alive connection pool: TCP/TLS setup is
+# paid once per pooled connection instead of per request, and transient
+# failure statuses retry with backoff
+_HTTP = requests.Session()
+_HTTP.mount('https://', HTTPAdapter(
+    pool_connections=64,
+    pool_maxsize=64,
+    max_retries=Retry(total=5, backoff_factor=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504])
+))
 
 
 class RedditScraper:
     """Scrapes Reddit posts for stock-related sentiment."""
+
+    # Authenticated PRAW clients shared across scraper instances, keyed on
+    # credentials — callers that construct a scraper per request would
+    # otherwise pay the OAuth handshake every time
+    _clients: Dict[tuple, praw.Reddit] = {}
+
+    # Cross-run record of post URLs already handed downstream, shared by all
+    # scraper instances and persisted on interpreter exit
+    _seen_urls = None
+    _SEEN_URLS_PATH = 'seen_reddit_urls.bloom'
+
+    @classmethod
+    def _get_seen_urls(cls) -> BloomFilter:
+        if cls._seen_urls is None:
+            cls._seen_urls = BloomFilter.load(cls._SEEN_URLS_PATH)
+            atexit.register(lambda: cls._seen_urls.save(cls._SEEN_URLS_PATH))
+        return cls._seen_urls
     
     def __init__(self, reddit_client_id: str, reddit_secret: str, user_agent: str):
         """Initialize Reddit scraper with PRAW client.
@@ -17,19 +53,26 @@ class RedditScraper:
             reddit_secret: Reddit API secret
             user_agent: User agent string for Reddit API
         """
+        key = (reddit_client_id, reddit_secret, user_agent)
+        if key in self._clients:
+            self.reddit = self._clients[key]
+            return
+
         try:
             self.reddit = praw.Reddit(
                 client_id=reddit_client_id,
                 client_secret=reddit_secret,
-                user_agent=user_agent
+                user_agent=user_agent,
+                requestor_kwargs={'session': _HTTP}
             )
             self.reddit.read_only = True
+            self._clients[key] = self.reddit
         except Exception as e:
             print(f"Error initializing Reddit client: {e}")
             self.reddit = None
     
     def scrape_subreddit(self, subreddit_name: str, limit: int = 100, 
-                        time_filter: str = 'day') -> List[Dict]:
+                        time_filter: str = 'day') -> List[PostRecord]:
         """Scrape posts from a subreddit.
         
         Args:
@@ -38,7 +81,7 @@ class RedditScraper:
             time_filter: Time filter ('all', 'day', 'hour', 'month', 'week', 'year')
             
         Returns:
-            List of dictionaries with post data
+            List of PostRecord objects
         """
         if not self.reddit:
             return []
@@ -48,86 +91,198 @@ class RedditScraper:
             posts = []
             
             for post in subreddit.top(time_filter=time_filter, limit=limit):
-                post_data = {
-                    'title': post.title,
-                    'content': post.selftext if post.selftext else '',
-                    'upvotes': post.score,
-                    'comments': post.num_comments,
-                    'timestamp': datetime.fromtimestamp(post.created_utc),
-                    'url': post.url,
-                    'author': str(post.author) if post.author else 'unknown',
-                    'stock_mentions': self._extract_stock_mentions(post.title + ' ' + post.selftext),
-                    'subreddit': subreddit_name
-                }
-                posts.append(post_data)
+                # Uppercase the combined text once; the extractor reuses it
+                text_upper = (post.title + ' ' + (post.selftext or '')).upper()
+                posts.append(PostRecord(
+                    title=post.title,
+                    content=post.selftext if post.selftext else '',
+                    upvotes=post.score,
+                    comments=post.num_comments,
+                    timestamp=datetime.fromtimestamp(post.created_utc),
+                    url=post.url,
+                    # .name is populated by the listing itself; coercing the
+                    # Redditor with str() can trigger a lazy /user/.../about/
+                    # fetch per post
+                    author=post.author.name if post.author else 'unknown',
+                    stock_mentions=tuple(extract_stock_mentions(text_upper, already_upper=True)),
+                    subreddit=subreddit_name
+                ))
             
             return posts
         except Exception as e:
             print(f"Error scraping subreddit {subreddit_name}: {e}")
             return []
     
-    def search_posts(self, query: str, limit: int = 100, 
-                    subreddits: Optional[List[str]] = None) -> List[Dict]:
+    def scrape_subreddits(self, subreddit_names: List[str], limit: int = 100,
+                          time_filter: str = 'day') -> List[PostRecord]:
+        """Scrape several subreddits concurrently.
+
+        Each PRAW listing call blocks on network round-trips, so fetching
+        subreddits on worker threads bounds wall time by the slowest
+        subreddit instead of the sum of all of them.
+
+        Args:
+            subreddit_names: Names of the subreddits to scrape
+            limit: Maximum number of posts per subreddit
+            time_filter: Time filter ('all', 'day', 'hour', 'month', 'week', 'year')
+
+        Returns:
+            List of PostRecord objects across all subreddits
+        """
+        if not self.reddit or not subreddit_names:
+            return []
+
+        posts = []
+        with ThreadPoolExecutor(max_workers=min(8, len(subreddit_names))) as executor:
+            futures = [executor.submit(self.scrape_subreddit, name, limit, time_filter)
+                       for name in subreddit_names]
+            for future in futures:
+                posts.extend(future.result())
+
+        return posts
+
+    def iter_posts(self, subreddit_names: List[str], limit: int = 100,
+                   time_filter: str = 'day') -> Iterator[PostRecord]:
+        """Stream posts from several subreddits as they arrive.
+
+        Unlike scrape_subreddits this never materializes the full batch:
+        fetches run on worker threads and records are yielded as each
+        subreddit completes, so downstream sentiment analysis and batched
+        DB writes overlap with the remaining network I/O and peak memory
+        stays bounded by one subreddit's page.
+
+        Args:
+            subreddit_names: Names of the subreddits to scrape
+            limit: Maximum number of posts per subreddit
+            time_filter: Time filter ('all', 'day', 'hour', 'month', 'week', 'year')
+
+        Yields:
+            PostRecord objects, grouped by whichever subreddit finished first
+        """
+        if not self.reddit or not subreddit_names:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(8, len(subreddit_names))) as executor:
+            futures = [executor.submit(self.scrape_subreddit, name, limit, time_filter)
+                       for name in subreddit_names]
+            for future in as_completed(futures):
+                yield from future.result()
+
+    def search_posts(self, query: str, limit: int = 100,
+                    subreddits: Optional[List[str]] = None) -> List[PostRecord]:
         """Search for posts matching a query.
-        
+
+        Multiple subreddits are combined with '+' in the subreddit path
+        (e.g. 'stocks+wallstreetbets'), so the whole list is covered by a
+        single API call instead of one call per subreddit.
+
         Args:
             query: Search query (e.g., stock ticker)
             limit: Maximum number of posts to retrieve
             subreddits: Optional list of subreddits to search in
-            
+
         Returns:
-            List of dictionaries with matching posts
+            List of PostRecord objects for matching posts
         """
         if not self.reddit:
             return []
-        
+
         try:
             posts = []
             search_limit = min(limit, 100)  # Reddit API limit per request
-            
-            if subreddits:
-                for subreddit_name in subreddits:
-                    subreddit = self.reddit.subreddit(subreddit_name)
-                    for post in subreddit.search(query, limit=search_limit, sort='hot'):
-                        post_data = {
-                            'title': post.title,
-                            'content': post.selftext if post.selftext else '',
-                            'upvotes': post.score,
-                            'comments': post.num_comments,
-                            'timestamp': datetime.fromtimestamp(post.created_utc),
-                            'url': post.url,
-                            'author': str(post.author) if post.author else 'unknown',
-                            'stock_mentions': self._extract_stock_mentions(post.title + ' ' + post.selftext),
-                            'subreddit': subreddit_name
-                        }
-                        posts.append(post_data)
-                        if len(posts) >= limit:
-                            break
-                    if len(posts) >= limit:
-                        break
-            else:
-                # Search across all subreddits
-                for post in self.reddit.subreddit('all').search(query, limit=search_limit, sort='hot'):
-                    post_data = {
-                        'title': post.title,
-                        'content': post.selftext if post.selftext else '',
-                        'upvotes': post.score,
-                        'comments': post.num_comments,
-                        'timestamp': datetime.fromtimestamp(post.created_utc),
-                        'url': post.url,
-                        'author': str(post.author) if post.author else 'unknown',
-                        'stock_mentions': self._extract_stock_mentions(post.title + ' ' + post.selftext),
-                        'subreddit': post.subreddit.display_name
-                    }
-                    posts.append(post_data)
-                    if len(posts) >= limit:
-                        break
-            
+            subreddit_name = '+'.join(subreddits) if subreddits else 'all'
+
+            for post in self.reddit.subreddit(subreddit_name).search(query, limit=search_limit, sort='hot'):
+                # Uppercase the combined text once; the extractor reuses it
+                text_upper = (post.title + ' ' + (post.selftext or '')).upper()
+                posts.append(PostRecord(
+                    title=post.title,
+                    content=post.selftext if post.selftext else '',
+                    upvotes=post.score,
+                    comments=post.num_comments,
+                    timestamp=datetime.fromtimestamp(post.created_utc),
+                    url=post.url,
+                    # .name is populated by the listing itself; coercing the
+                    # Redditor with str() can trigger a lazy /user/.../about/
+                    # fetch per post
+                    author=post.author.name if post.author else 'unknown',
+                    stock_mentions=tuple(extract_stock_mentions(text_upper, already_upper=True)),
+                    subreddit=post.subreddit.display_name
+                ))
+                if len(posts) >= limit:
+                    break
+
             return posts[:limit]
         except Exception as e:
             print(f"Error searching Reddit posts: {e}")
             return []
     
+    def search_posts_json(self, query: str, limit: int = 100,
+                          subreddits: Optional[List[str]] = None,
+                          after: Optional[float] = None,
+                          before: Optional[float] = None) -> List[PostRecord]:
+        """Search posts via Reddit's public JSON listing endpoint.
+
+        One GET returns the raw listing, which maps straight into post
+        dicts — no PRAW lazy-object layer, no per-attribute fetch risk.
+        Useful for historical queries where created_utc bounds matter and
+        for read paths that shouldn't spend OAuth rate limit.
+
+        Args:
+            query: Search query (e.g., stock ticker)
+            limit: Maximum number of posts to retrieve
+            subreddits: Optional list of subreddits to search in
+            after: Optional epoch lower bound on post creation time
+            before: Optional epoch upper bound on post creation time
+
+        Returns:
+            List of PostRecord objects for matching posts
+        """
+        subreddit_path = '+'.join(subreddits) if subreddits else 'all'
+        url = f'https://www.reddit.com/r/{subreddit_path}/search.json'
+        params = {
+            'q': query,
+            'limit': min(limit, 100),
+            'sort': 'new',
+            'restrict_sr': 'true' if subreddits else 'false'
+        }
+
+        posts = []
+        try:
+            response = _HTTP.get(
+                url, params=params, timeout=10,
+                headers={'User-Agent': 'sentiment-trading-bot/1.0'}
+            )
+            response.raise_for_status()
+
+            for child in response.json().get('data', {}).get('children', []):
+                data = child.get('data', {})
+                created = data.get('created_utc', 0)
+                if after is not None and created < after:
+                    continue
+                if before is not None and created > before:
+                    continue
+
+                text_upper = (data.get('title', '') + ' ' + (data.get('selftext') or '')).upper()
+                posts.append(PostRecord(
+                    title=data.get('title', ''),
+                    content=data.get('selftext') or '',
+                    upvotes=data.get('score', 0),
+                    comments=data.get('num_comments', 0),
+                    timestamp=datetime.fromtimestamp(created),
+                    url=data.get('url', ''),
+                    author=data.get('author') or 'unknown',
+                    stock_mentions=tuple(extract_stock_mentions(text_upper, already_upper=True)),
+                    subreddit=data.get('subreddit', '')
+                ))
+                if len(posts) >= limit:
+                    break
+
+            return posts
+        except Exception as e:
+            print(f"Error searching Reddit JSON endpoint: {e}")
+            return posts
+
     def _extract_stock_mentions(self, text: str) -> List[str]:
         """Extract stock ticker mentions from text (e.g., $AAPL, AAPL).
         
@@ -137,52 +292,42 @@ class RedditScraper:
         Returns:
             List of mentioned stock tickers
         """
-        # Pattern for $TICKER format
-        dollar_pattern = r'\$([A-Z]{1,5})\b'
-        # Pattern for standalone tickers (common ones)
-        standalone_pattern = r'\b([A-Z]{1,5})\b'
-        
-        tickers = set()
-        
-        # Find $TICKER mentions
-        dollar_matches = re.findall(dollar_pattern, text.upper())
-        tickers.update(dollar_matches)
-        
-        # Common stock tickers to check (major ones)
-        common_tickers = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'META', 'NVDA', 'NFLX']
-        for ticker in common_tickers:
-            if ticker in text.upper():
-                tickers.add(ticker)
-        
-        return list(tickers)
+        return extract_stock_mentions(text)
     
     def get_posts_for_ticker(self, ticker: str, limit: int = 50,
-                             subreddits: Optional[List[str]] = None) -> List[Dict]:
+                             subreddits: Optional[List[str]] = None,
+                             skip_seen: bool = False) -> List[PostRecord]:
         """Get posts specifically mentioning a stock ticker.
         
         Args:
             ticker: Stock ticker symbol
             limit: Maximum number of posts to retrieve
             subreddits: Optional list of subreddits to search in
+            skip_seen: Drop posts already returned by earlier runs, tracked
+                in a persistent Bloom filter (for ingestion pipelines, so
+                already-analyzed posts don't re-enter the sentiment queue)
             
         Returns:
-            List of dictionaries with post data
+            List of PostRecord objects
         """
-        # Search for both $TICKER and TICKER
-        queries = [f'${ticker}', ticker]
-        all_posts = []
-        
-        for query in queries:
-            posts = self.search_posts(query, limit=limit // len(queries), subreddits=subreddits)
-            all_posts.extend(posts)
+        # One Lucene-style OR query covers both $TICKER and TICKER forms,
+        # halving API calls versus issuing the two searches separately
+        query = f'${ticker} OR {ticker}'
+        all_posts = self.search_posts(query, limit=limit, subreddits=subreddits)
         
         # Remove duplicates based on URL
         seen_urls = set()
         unique_posts = []
+        seen_filter = self._get_seen_urls() if skip_seen else None
         for post in all_posts:
-            if post['url'] not in seen_urls:
-                seen_urls.add(post['url'])
-                unique_posts.append(post)
+            if post['url'] in seen_urls:
+                continue
+            seen_urls.add(post['url'])
+            if seen_filter is not None:
+                if post['url'] in seen_filter:
+                    continue
+                seen_filter.add(post['url'])
+            unique_posts.append(post)
         
         return unique_posts[:limit]
 
@@ -0,0 +1,112 @@
+"""Shared stock ticker vocabulary and mention extraction."""
+
+import re
+import sys
+from array import array
+from typing import List
+
+# Process-wide bidirectional ticker <-> small-int mapping. Interning the
+# strings means every post's mention list shares one object per ticker
+# instead of duplicating ~50B str objects across millions of rows, and the
+# int16 encoding packs a mention list into 2 bytes per ticker for bulk
+# in-memory analytics.
+_TICKER_ID = {}
+_ID_TICKER = []
+
+
+def ticker_id(ticker: str) -> int:
+    """Return a stable (per-process) small-int id for a ticker.
+
+    Args:
+        ticker: Uppercased ticker symbol
+
+    Returns:
+        Integer id, assigned on first sight
+    """
+    tid = _TICKER_ID.get(ticker)
+    if tid is None:
+        ticker = sys.intern(ticker)
+        tid = len(_ID_TICKER)
+        _TICKER_ID[ticker] = tid
+        _ID_TICKER.append(ticker)
+    return tid
+
+
+def ticker_from_id(tid: int) -> str:
+    """Return the ticker symbol for an id from ticker_id()."""
+    return _ID_TICKER[tid]
+
+
+def encode_mentions(tickers: List[str]) -> array:
+    """Pack a mention list into a compact uint16 array (2 bytes/ticker)."""
+    return array('H', (ticker_id(t) for t in tickers))
+
+
+def decode_mentions(encoded) -> List[str]:
+    """Inverse of encode_mentions; accepts the array or its raw bytes."""
+    if isinstance(encoded, (bytes, bytearray)):
+        values = array('H')
+        values.frombytes(encoded)
+        encoded = values
+    return [_ID_TICKER[tid] for tid in encoded]
+
+# Common stock tickers to check (major ones). Extend this tuple as the
+# watchlist grows; extraction cost stays linear in text length either way.
+COMMON_TICKERS = ('AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'META', 'NVDA', 'NFLX')
+
+# Pattern for $TICKER format
+DOLLAR_TICKER_RE = re.compile(r'\$([A-Z]{1,5})\b')
+
+# All common tickers folded into one alternation so the text is scanned in a
+# single pass instead of one substring scan per ticker — O(len(text)) rather
+# than O(len(tickers) * len(text)). The \b anchors enforce word boundaries,
+# which the old substring check did not (e.g. 'METAL' matched META).
+COMMON_TICKER_RE = re.compile(r'\b(' + '|'.join(COMMON_TICKERS) + r')\b')
+
+
+def extract_stock_mentions(text: str, already_upper: bool = False) -> list:
+    """Extract stock ticker mentions from text (e.g., $AAPL, AAPL).
+
+    Args:
+        text: Text to search for stock mentions
+        already_upper: Skip the internal .upper() when the caller has
+            uppercased the text once already (avoids re-allocating large
+            intermediate strings for multi-KB post bodies)
+
+    Returns:
+        List of mentioned stock tickers
+    """
+    upper = text if already_upper else text.upper()
+
+    tickers = set(DOLLAR_TICKER_RE.findall(upper))
+    tickers.update(COMMON_TICKER_RE.findall(upper))
+
+    # Interned so repeated mentions across posts share one str object
+    return [sys.intern(t) for t in tickers]
+
+
+def extract_stock_mentions_batch(texts):
+    """Extract stock mentions for a whole batch of texts at once.
+
+    Runs both compiled patterns through pandas' string machinery instead of
+    a Python-level call per post, which is the cheaper shape when scoring
+    thousands of collected posts after a scrape.
+
+    Args:
+        texts: pandas Series of text strings (NaN treated as empty)
+
+    Returns:
+        pandas Series of ticker lists, aligned with the input index
+    """
+    # Local import keeps the scrapers' import of this module light
+    import pandas as pd
+
+    if texts.empty:
+        return pd.Series([], index=texts.index, dtype=object)
+
+    upper = texts.fillna('').str.upper()
+    dollar = upper.str.findall(DOLLAR_TICKER_RE)
+    common = upper.str.findall(COMMON_TICKER_RE)
+
+    # dict.fromkeys dedupes while keeping first-mention order
+    return (dollar + common).map(lambda mentions: list(dict.fromkeys(mentions)))
@@ -1,13 +1,34 @@
 """Twitter/X scraper for collecting stock sentiment from tweets."""
 
+import atexit
 import tweepy
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from datetime import datetime
-import re
+
+from .dedup import BloomFilter
+from .tickers import extract_stock_mentions
 
 
 class TwitterScraper:
     """Scrapes Twitter/X for stock-related sentiment."""
+
+    # Authenticated tweepy clients shared across scraper instances, keyed on
+    # credentials, so per-request scraper construction reuses the session
+    # instead of re-authenticating
+    _clients: Dict[tuple, tuple] = {}
+
+    # Cross-run record of tweet IDs already handed downstream, shared by all
+    # scraper instances and persisted on interpreter exit
+    _seen_ids = None
+    _SEEN_IDS_PATH = 'seen_tweet_ids.bloom'
+
+    @classmethod
+    def _get_seen_ids(cls) -> BloomFilter:
+        if cls._seen_ids is None:
+            cls._seen_ids = BloomFilter.load(cls._SEEN_IDS_PATH)
+            atexit.register(lambda: cls._seen_ids.save(cls._SEEN_IDS_PATH))
+        return cls._seen_ids
     
     def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None, 
                  bearer_token: Optional[str] = None):
@@ -18,10 +39,16 @@ class TwitterScraper:
             api_secret: Twitter API secret (optional if using bearer token)
             bearer_token: Twitter Bearer Token for API v2
         """
+        key = (api_key, api_secret, bearer_token)
+        if key in self._clients:
+            self.client, self.api = self._clients[key]
+            return
+
         try:
             if bearer_token:
                 # Use Bearer Token for API v2 (recommended)
                 self.client = tweepy.Client(bearer_token=bearer_token, wait_on_rate_limit=True)
+                self.api = None
             elif api_key and api_secret:
                 # Legacy API v1.1 (deprecated but may still work)
                 auth = tweepy.AppAuthHandler(api_key, api_secret)
@@ -31,6 +58,7 @@ class TwitterScraper:
                 print("Warning: No Twitter API credentials provided. Scraping will be limited.")
                 self.client = None
                 self.api = None
+            self._clients[key] = (self.client, self.api)
         except Exception as e:
             print(f"Error initializing Twitter client: {e}")
             self.client = None
@@ -40,9 +68,13 @@ class TwitterScraper:
                      tweet_fields: Optional[List[str]] = None) -> List[Dict]:
         """Search tweets matching a query.
         
+        Requests above the API's 100-per-request cap are paginated with
+        tweepy.Paginator; previously anything over 100 silently came back
+        truncated to one page.
+
         Args:
             query: Search query (stock symbols, $AAPL, etc.)
-            max_results: Maximum number of tweets to retrieve (max 100 per request)
+            max_results: Maximum number of tweets to retrieve
             tweet_fields: Optional list of tweet fields to include
             
         Returns:
@@ -57,69 +89,80 @@ class TwitterScraper:
                 tweet_fields = ['id', 'text', 'created_at', 'public_metrics', 'author_id']
             
             tweets = []
-            # Twitter API v2 allows max 100 results per request
-            batch_size = min(max_results, 100)
-            
-            response = self.client.search_recent_tweets(
+            # Iterate pages (rather than flatten()) so each page's includes
+            # are still available for the author lookup
+            paginator = tweepy.Paginator(
+                self.client.search_recent_tweets,
                 query=query,
-                max_results=batch_size,
+                max_results=min(max_results, 100),
                 tweet_fields=tweet_fields,
                 expansions=['author_id']
             )
-            
-            if not response.data:
-                return []
-            
-            # Create author lookup
-            authors = {}
-            if response.includes and 'users' in response.includes:
-                for user in response.includes['users']:
-                    authors[user.id] = user.username
-            
-            for tweet in response.data:
-                metrics = tweet.public_metrics if hasattr(tweet, 'public_metrics') else {}
-                tweet_data = {
-                    'id': tweet.id,
-                    'text': tweet.text,
-                    'retweets': metrics.get('retweet_count', 0),
-                    'likes': metrics.get('like_count', 0),
-                    'replies': metrics.get('reply_count', 0),
-                    'timestamp': tweet.created_at,
-                    'author': authors.get(tweet.author_id, 'unknown') if hasattr(tweet, 'author_id') else 'unknown',
-                    'stock_mentions': self._extract_stock_mentions(tweet.text)
-                }
-                tweets.append(tweet_data)
-            
+
+            for response in paginator:
+                if not response.data:
+                    break
+
+                # Create author lookup
+                authors = {}
+                if response.includes and 'users' in response.includes:
+                    for user in response.includes['users']:
+                        authors[user.id] = user.username
+
+                for tweet in response.data:
+                    metrics = tweet.public_metrics if hasattr(tweet, 'public_metrics') else {}
+                    tweet_data = {
+                        'id': tweet.id,
+                        'text': tweet.text,
+                        'retweets': metrics.get('retweet_count', 0),
+                        'likes': metrics.get('like_count', 0),
+                        'replies': metrics.get('reply_count', 0),
+                        'timestamp': tweet.created_at,
+                        'author': authors.get(tweet.author_id, 'unknown') if hasattr(tweet, 'author_id') else 'unknown',
+                        'stock_mentions': self._extract_stock_mentions(tweet.text)
+                    }
+                    tweets.append(tweet_data)
+                    if len(tweets) >= max_results:
+                        return tweets
+
             return tweets
         except Exception as e:
             print(f"Error searching tweets: {e}")
             return []
     
-    def get_tweets_for_ticker(self, ticker: str, max_results: int = 50) -> List[Dict]:
+    def get_tweets_for_ticker(self, ticker: str, max_results: int = 50,
+                              skip_seen: bool = False) -> List[Dict]:
         """Get tweets specifically mentioning a stock ticker.
         
         Args:
             ticker: Stock ticker symbol
             max_results: Maximum number of tweets to retrieve
+            skip_seen: Drop tweets already returned by earlier runs, tracked
+                in a persistent Bloom filter (for ingestion pipelines, so
+                already-analyzed tweets don't re-enter the sentiment queue)
             
         Returns:
             List of dictionaries with tweet data
         """
-        # Search for both $TICKER and TICKER
-        queries = [f'${ticker}', f'{ticker} stock']
-        all_tweets = []
-        
-        for query in queries:
-            tweets = self.search_tweets(query, max_results=max_results // len(queries))
-            all_tweets.extend(tweets)
+        # Twitter API v2 supports parenthesized OR, so one query covers both
+        # the cashtag and keyword forms in a single request
+        query = f'(${ticker} OR {ticker} stock)'
+        all_tweets = self.search_tweets(query, max_results=max_results)
         
         # Remove duplicates based on tweet ID
         seen_ids = set()
         unique_tweets = []
+        seen_filter = self._get_seen_ids() if skip_seen else None
         for tweet in all_tweets:
-            if tweet['id'] not in seen_ids:
-                seen_ids.add(tweet['id'])
-                unique_tweets.append(tweet)
+            if tweet['id'] in seen_ids:
+                continue
+            seen_ids.add(tweet['id'])
+            if seen_filter is not None:
+                key = str(tweet['id'])
+                if key in seen_filter:
+                    continue
+                seen_filter.add(key)
+            unique_tweets.append(tweet)
         
         return unique_tweets[:max_results]
     
@@ -132,16 +175,7 @@ class TwitterScraper:
         Returns:
             List of mentioned stock tickers
         """
-        # Pattern for $TICKER format
-        dollar_pattern = r'\$([A-Z]{1,5})\b'
-        
-        tickers = set()
-        
-        # Find $TICKER mentions
-        dollar_matches = re.findall(dollar_pattern, text.upper())
-        tickers.update(dollar_matches)
-        
-        return list(tickers)
+        return extract_stock_mentions(text)
     
     def get_trending_stock_tweets(self, max_results: int = 50) -> List[Dict]:
         """Get tweets about trending stock-related topics.
@@ -164,9 +198,13 @@ class TwitterScraper:
         all_tweets = []
         tweets_per_query = max_results // len(trending_queries)
         
-        for query in trending_queries:
-            tweets = self.search_tweets(query, max_results=tweets_per_query)
-            all_tweets.extend(tweets)
+        # Each query is an independent blocking API call; running them on
+        # worker threads bounds wall time by the slowest query, not the sum
+        with ThreadPoolExecutor(max_workers=min(8, len(trending_queries))) as executor:
+            futures = [executor.submit(self.search_tweets, query, tweets_per_query)
+                       for query in trending_queries]
+            for future in futures:
+                all_tweets.extend(future.result())
         
         # Remove duplicates
         seen_ids = set()
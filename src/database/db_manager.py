@@ -1,13 +1,14 @@
 """Database manager for handling database operations."""
 
 import os
-from sqlalchemy import create_engine, and_
+from sqlalchemy import create_engine, and_, event, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta
 import pandas as pd
 from typing import List, Dict, Optional
-from .models import Base, SentimentData, MarketData, TradingSignal, BacktestResult
+from .models import Base, SentimentData, MarketData, TradingSignal, BacktestResult, make_engine
 
 
 class DatabaseManager:
@@ -20,7 +21,22 @@ class DatabaseManager:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
-        self.engine = create_engine(f'sqlite:///{db_path}', echo=False)
+        self.engine = make_engine(f'sqlite:///{db_path}', echo=False)
+
+        @event.listens_for(self.engine, 'connect')
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            # WAL lets readers proceed during writes and NORMAL drops the
+            # second fsync per commit (safe: WAL recovers to a consistent
+            # state after a crash). The defaults (journal_mode=DELETE,
+            # synchronous=FULL) fsync twice per commit.
+            cursor = dbapi_connection.cursor()
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
+            cursor.execute('PRAGMA cache_size=-64000')
+            cursor.execute('PRAGMA temp_store=MEMORY')
+            cursor.execute('PRAGMA mmap_size=268435456')
+            cursor.close()
+
         Base.metadata.create_all(self.engine)
         self.SessionLocal = sessionmaker(bind=self.engine)
     
@@ -37,35 +53,65 @@ class DatabaseManager:
         Returns:
             ID of inserted record, or None if error
         """
-        session = self.get_session()
         try:
-            sentiment = SentimentData(
-                ticker=data.get('ticker'),
-                source=data.get('source'),
-                text=data.get('text'),
-                sentiment_score=data.get('sentiment_score', 0.0),
-                sentiment_label=data.get('sentiment_label', 'neutral'),
-                confidence=data.get('confidence', 0.0),
-                timestamp=data.get('timestamp', datetime.utcnow()),
-                raw_data=data.get('raw_data'),
-                metadata=data.get('metadata')
-            )
-            session.add(sentiment)
-            session.commit()
-            record_id = sentiment.id
-            session.close()
-            return record_id
+            # begin() commits on clean exit and rolls back + closes on error,
+            # so no exception path can leak a pooled connection
+            with self.SessionLocal.begin() as session:
+                sentiment = SentimentData(
+                    ticker=data.get('ticker'),
+                    source=data.get('source'),
+                    text=data.get('text'),
+                    sentiment_score=data.get('sentiment_score', 0.0),
+                    sentiment_label=data.get('sentiment_label', 'neutral'),
+                    confidence=data.get('confidence', 0.0),
+                    timestamp=data.get('timestamp', datetime.utcnow()),
+                    raw_data=data.get('raw_data'),
+                    extra_metadata=data.get('metadata')
+                )
+                session.add(sentiment)
+                session.flush()
+                return sentiment.id
         except IntegrityError as e:
-            session.rollback()
-            session.close()
             print(f"Error saving sentiment data: {e}")
             return None
         except Exception as e:
-            session.rollback()
-            session.close()
             print(f"Unexpected error saving sentiment data: {e}")
             return None
     
+    def save_sentiment_data_batch(self, rows: List[Dict]) -> int:
+        """Save multiple sentiment records in a single transaction.
+
+        Per-row commits pay one fsync each, which dominates SQLite write
+        throughput; a single bulk insert amortizes that across the batch.
+
+        Args:
+            rows: List of dictionaries containing sentiment data fields
+
+        Returns:
+            Number of rows inserted (0 on error)
+        """
+        if not rows:
+            return 0
+
+        try:
+            mappings = [{
+                'ticker': row.get('ticker'),
+                'source': row.get('source'),
+                'text': row.get('text'),
+                'sentiment_score': row.get('sentiment_score', 0.0),
+                'sentiment_label': row.get('sentiment_label', 'neutral'),
+                'confidence': row.get('confidence', 0.0),
+                'timestamp': row.get('timestamp', datetime.utcnow()),
+                'raw_data': row.get('raw_data'),
+                'extra_metadata': row.get('metadata')
+            } for row in rows]
+            with self.SessionLocal.begin() as session:
+                SentimentData.bulk_insert(session, mappings)
+            return len(mappings)
+        except Exception as e:
+            print(f"Error saving sentiment data batch: {e}")
+            return 0
+
     def save_market_data(self, data: Dict) -> Optional[int]:
         """Save or update market data (upsert by ticker+date).
         
@@ -75,48 +121,29 @@ class DatabaseManager:
         Returns:
             ID of inserted/updated record, or None if error
         """
-        session = self.get_session()
         try:
-            # Check if record exists
-            existing = session.query(MarketData).filter(
-                and_(
-                    MarketData.ticker == data.get('ticker'),
-                    MarketData.date == data.get('date')
-                )
-            ).first()
-            
-            if existing:
-                # Update existing record
-                existing.open = data.get('open', existing.open)
-                existing.high = data.get('high', existing.high)
-                existing.low = data.get('low', existing.low)
-                existing.close = data.get('close', existing.close)
-                existing.volume = data.get('volume', existing.volume)
-                if data.get('indicators'):
-                    existing.indicators = data.get('indicators')
-                session.commit()
-                record_id = existing.id
-            else:
-                # Insert new record
-                market = MarketData(
-                    ticker=data.get('ticker'),
-                    date=data.get('date'),
-                    open=data.get('open'),
-                    high=data.get('high'),
-                    low=data.get('low'),
-                    close=data.get('close'),
-                    volume=data.get('volume'),
-                    indicators=data.get('indicators')
-                )
-                session.add(market)
-                session.commit()
-                record_id = market.id
-            
-            session.close()
-            return record_id
+            # Native UPSERT: one round-trip instead of SELECT-then-UPDATE-or-
+            # INSERT. Relies on the unique (ticker, date) index on MarketData.
+            values = {
+                'ticker': data.get('ticker'),
+                'date': data.get('date'),
+                'open': data.get('open'),
+                'high': data.get('high'),
+                'low': data.get('low'),
+                'close': data.get('close'),
+                'volume': data.get('volume'),
+                'indicators': data.get('indicators')
+            }
+            update_cols = {k: v for k, v in values.items()
+                           if k not in ('ticker', 'date') and v is not None}
+            stmt = sqlite_insert(MarketData).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['ticker', 'date'],
+                set_=update_cols
+            ).returning(MarketData.id)
+            with self.SessionLocal.begin() as session:
+                return session.execute(stmt).scalar_one()
         except Exception as e:
-            session.rollback()
-            session.close()
             print(f"Error saving market data: {e}")
             return None
     
@@ -132,42 +159,50 @@ class DatabaseManager:
         Returns:
             DataFrame with aggregated daily sentiment data
         """
-        session = self.get_session()
         try:
-            results = session.query(SentimentData).filter(
-                and_(
-                    SentimentData.ticker == ticker.upper(),
-                    SentimentData.timestamp >= start_date,
-                    SentimentData.timestamp <= end_date
-                )
-            ).all()
-            session.close()
-            
-            if not results:
-                return pd.DataFrame()
-            
-            # Convert to list of dicts
-            data = [r.to_dict() for r in results]
-            df = pd.DataFrame(data)
-            
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            
-            # Group by date and aggregate
-            df['date'] = df['timestamp'].dt.date
-            daily_agg = df.groupby('date').agg({
-                'sentiment_score': ['mean', 'count'],
-                'confidence': 'mean',
-                'sentiment_label': lambda x: x.value_counts().to_dict()
-            }).reset_index()
-            
-            daily_agg.columns = ['date', 'avg_sentiment_score', 'mention_count', 
-                                'avg_confidence', 'sentiment_distribution']
+            # Aggregate in SQL so only one row per day crosses the wire,
+            # instead of hydrating every raw sentiment row into ORM objects
+            # and grouping in pandas
+            date_col = func.date(SentimentData.timestamp).label('date')
+            filters = and_(
+                SentimentData.ticker == ticker.upper(),
+                SentimentData.timestamp >= start_date,
+                SentimentData.timestamp <= end_date
+            )
+
+            with self.SessionLocal() as session:
+                rows = session.query(
+                    date_col,
+                    func.avg(SentimentData.sentiment_score).label('avg_sentiment_score'),
+                    func.count().label('mention_count'),
+                    func.avg(SentimentData.confidence).label('avg_confidence')
+                ).filter(filters).group_by(date_col).order_by(date_col).all()
+
+                if not rows:
+                    return pd.DataFrame()
+
+                # Second grouped query for the per-label counts; still bounded
+                # by distinct (date, label) pairs rather than raw row count
+                label_rows = session.query(
+                    date_col,
+                    SentimentData.sentiment_label,
+                    func.count()
+                ).filter(filters).group_by(
+                    date_col, SentimentData.sentiment_label
+                ).all()
+
+            distributions = {}
+            for date_value, label, count in label_rows:
+                distributions.setdefault(date_value, {})[label] = count
+
+            daily_agg = pd.DataFrame(rows, columns=[
+                'date', 'avg_sentiment_score', 'mention_count', 'avg_confidence'
+            ])
+            daily_agg['sentiment_distribution'] = daily_agg['date'].map(distributions)
             daily_agg['date'] = pd.to_datetime(daily_agg['date'])
             
             return daily_agg
         except Exception as e:
-            session.close()
             print(f"Error getting historical sentiment: {e}")
             return pd.DataFrame()
     
@@ -183,31 +218,20 @@ class DatabaseManager:
         Returns:
             DataFrame with OHLCV data
         """
-        session = self.get_session()
         try:
-            results = session.query(MarketData).filter(
+            # Read straight from the DBAPI cursor into typed columns; no ORM
+            # hydration and no intermediate list of per-row dicts
+            stmt = select(MarketData).where(
                 and_(
                     MarketData.ticker == ticker.upper(),
                     MarketData.date >= start_date,
                     MarketData.date <= end_date
                 )
-            ).order_by(MarketData.date).all()
-            session.close()
-            
-            if not results:
-                return pd.DataFrame()
-            
-            # Convert to list of dicts
-            data = [r.to_dict() for r in results]
-            df = pd.DataFrame(data)
-            
-            # Convert date to datetime and set as index
-            df['date'] = pd.to_datetime(df['date'])
-            df.set_index('date', inplace=True)
-            
-            return df
+            ).order_by(MarketData.date)
+
+            return pd.read_sql_query(stmt, self.engine, index_col='date',
+                                     parse_dates=['date'])
         except Exception as e:
-            session.close()
             print(f"Error getting historical market data: {e}")
             return pd.DataFrame()
     
@@ -220,28 +244,56 @@ class DatabaseManager:
         Returns:
             ID of inserted record, or None if error
         """
-        session = self.get_session()
         try:
-            trading_signal = TradingSignal(
-                ticker=signal.get('ticker'),
-                signal_type=signal.get('signal_type'),
-                confidence=signal.get('confidence'),
-                sentiment_score=signal.get('sentiment_score'),
-                technical_indicators=signal.get('technical_indicators'),
-                timestamp=signal.get('timestamp', datetime.utcnow()),
-                reasoning=signal.get('reasoning')
-            )
-            session.add(trading_signal)
-            session.commit()
-            record_id = trading_signal.id
-            session.close()
-            return record_id
+            with self.SessionLocal.begin() as session:
+                trading_signal = TradingSignal(
+                    ticker=signal.get('ticker'),
+                    signal_type=signal.get('signal_type'),
+                    confidence=signal.get('confidence'),
+                    sentiment_score=signal.get('sentiment_score'),
+                    technical_indicators=signal.get('technical_indicators'),
+                    timestamp=signal.get('timestamp', datetime.utcnow()),
+                    reasoning=signal.get('reasoning')
+                )
+                session.add(trading_signal)
+                session.flush()
+                return trading_signal.id
         except Exception as e:
-            session.rollback()
-            session.close()
             print(f"Error saving trading signal: {e}")
             return None
     
+    def save_trading_signals_batch(self, signals: List[Dict]) -> int:
+        """Save multiple trading signals in a single transaction.
+
+        Amortizes the per-statement commit/fsync cost across the batch,
+        which dominates SQLite write throughput.
+
+        Args:
+            signals: List of dictionaries containing signal data
+
+        Returns:
+            Number of rows inserted (0 on error)
+        """
+        if not signals:
+            return 0
+
+        try:
+            rows = [{
+                'ticker': signal.get('ticker'),
+                'signal_type': signal.get('signal_type'),
+                'confidence': signal.get('confidence'),
+                'sentiment_score': signal.get('sentiment_score'),
+                'technical_indicators': signal.get('technical_indicators'),
+                'timestamp': signal.get('timestamp', datetime.utcnow()),
+                'reasoning': signal.get('reasoning')
+            } for signal in signals]
+            with self.SessionLocal.begin() as session:
+                TradingSignal.bulk_insert(session, rows)
+            return len(rows)
+        except Exception as e:
+            print(f"Error saving trading signals batch: {e}")
+            return 0
+
     def save_backtest_result(self, result: Dict) -> Optional[int]:
         """Save backtest result to database.
         
@@ -251,30 +303,26 @@ class DatabaseManager:
         Returns:
             ID of inserted record, or None if error
         """
-        session = self.get_session()
         try:
-            backtest = BacktestResult(
-                strategy_name=result.get('strategy_name'),
-                ticker=result.get('ticker'),
-                start_date=result.get('start_date'),
-                end_date=result.get('end_date'),
-                initial_capital=result.get('initial_capital'),
-                final_value=result.get('final_value'),
-                total_return=result.get('total_return'),
-                sharpe_ratio=result.get('sharpe_ratio'),
-                max_drawdown=result.get('max_drawdown'),
-                win_rate=result.get('win_rate'),
-                vs_sp500_performance=result.get('vs_sp500_performance'),
-                daily_returns=result.get('daily_returns')
-            )
-            session.add(backtest)
-            session.commit()
-            record_id = backtest.id
-            session.close()
-            return record_id
+            with self.SessionLocal.begin() as session:
+                backtest = BacktestResult(
+                    strategy_name=result.get('strategy_name'),
+                    ticker=result.get('ticker'),
+                    start_date=result.get('start_date'),
+                    end_date=result.get('end_date'),
+                    initial_capital=result.get('initial_capital'),
+                    final_value=result.get('final_value'),
+                    total_return=result.get('total_return'),
+                    sharpe_ratio=result.get('sharpe_ratio'),
+                    max_drawdown=result.get('max_drawdown'),
+                    win_rate=result.get('win_rate'),
+                    vs_sp500_performance=result.get('vs_sp500_performance'),
+                    daily_returns=result.get('daily_returns')
+                )
+                session.add(backtest)
+                session.flush()
+                return backtest.id
         except Exception as e:
-            session.rollback()
-            session.close()
             print(f"Error saving backtest result: {e}")
             return None
     
@@ -288,16 +336,14 @@ class DatabaseManager:
         Returns:
             List of sentiment data dictionaries
         """
-        session = self.get_session()
         try:
-            results = session.query(SentimentData).filter(
-                SentimentData.ticker == ticker.upper()
-            ).order_by(SentimentData.timestamp.desc()).limit(limit).all()
-            session.close()
-            
-            return [r.to_dict() for r in results]
+            with self.SessionLocal() as session:
+                results = session.query(SentimentData).filter(
+                    SentimentData.ticker == ticker.upper()
+                ).order_by(SentimentData.timestamp.desc()).limit(limit).all()
+
+                return [r.to_dict() for r in results]
         except Exception as e:
-            session.close()
             print(f"Error getting recent sentiment snippets: {e}")
             return []
 
@@ -1,11 +1,62 @@
 """Database models for sentiment and market data storage."""
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, JSON
+from sqlalchemy import create_engine, insert, Column, Index, Integer, String, Float, DateTime, Text, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
 
-Base = declarative_base()
+
+class _BulkInsertMixin:
+    """Adds a fast multi-row insert to every model."""
+
+    @classmethod
+    def bulk_insert(cls, session, rows):
+        """Insert many rows with one executemany-style statement.
+
+        Uses SQLAlchemy 2.0 insertmanyvalues instead of per-row
+        session.add(), skipping ORM object construction and flush
+        bookkeeping — several times faster when loading large batches.
+
+        Args:
+            session: Active SQLAlchemy session (caller owns the transaction)
+            rows: List of column-name -> value dicts
+        """
+        if rows:
+            session.execute(insert(cls), rows)
+
+
+Base = declarative_base(cls=_BulkInsertMixin)
+
+# JSONB on Postgres — binary storage that skips reparsing on read and
+# supports GIN indexing — while SQLite and others keep plain JSON
+JSONCol = JSON().with_variant(JSONB(), 'postgresql')
+
+
+def make_engine(url: str, **kwargs):
+    """Create the project's engine with sane pooling defaults.
+
+    Centralizes engine construction so callers never pay ad-hoc
+    per-request connection setup: server databases get a sized pool with
+    pre-ping and recycling, SQLite gets cross-thread connections (its
+    connections are cheap, so pool sizing doesn't apply).
+
+    Args:
+        url: SQLAlchemy database URL
+        **kwargs: Extra create_engine options, override the defaults
+
+    Returns:
+        Configured SQLAlchemy Engine
+    """
+    if url.startswith('sqlite'):
+        # Pooled connections are shared across scraper worker threads
+        kwargs.setdefault('connect_args', {'check_same_thread': False})
+    else:
+        kwargs.setdefault('pool_size', 10)
+        kwargs.setdefault('max_overflow', 20)
+        kwargs.setdefault('pool_recycle', 3600)
+        kwargs.setdefault('pool_pre_ping', True)
+    return create_engine(url, **kwargs)
 
 
 class SentimentData(Base):
@@ -19,9 +70,19 @@ class SentimentData(Base):
     sentiment_score = Column(Float, nullable=False)  # -1 to 1
     sentiment_label = Column(String(20), nullable=False)  # positive, negative, neutral
     confidence = Column(Float, default=0.0)  # 0 to 1
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
-    raw_data = Column(JSON)  # Store original API response
-    metadata = Column(JSON)  # Additional metadata (upvotes, retweets, etc.)
+    timestamp = Column(DateTime, default=datetime.utcnow)
+    raw_data = Column(JSONCol)  # Store original API response
+    # 'metadata' is reserved on declarative classes (Base.metadata), so the
+    # attribute is extra_metadata while the SQL column keeps its name
+    extra_metadata = Column('metadata', JSONCol)  # Additional metadata (upvotes, retweets, etc.)
+
+    # Historical queries filter by ticker and range-scan the timestamp; the
+    # composite index serves both in one b-tree walk instead of a
+    # ticker-index lookup followed by a filter over every row. No separate
+    # timestamp index — it would only add write amplification.
+    __table_args__ = (
+        Index('ix_sentiment_ticker_timestamp', 'ticker', 'timestamp'),
+    )
     
     def to_dict(self):
         return {
@@ -34,7 +95,7 @@ class SentimentData(Base):
             'confidence': self.confidence,
             'timestamp': self.timestamp.isoformat() if self.timestamp else None,
             'raw_data': self.raw_data,
-            'metadata': self.metadata
+            'metadata': self.extra_metadata
         }
 
 
@@ -44,13 +105,19 @@ class MarketData(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     ticker = Column(String(10), nullable=False, index=True)
-    date = Column(DateTime, nullable=False, index=True)
+    date = Column(DateTime, nullable=False)
     open = Column(Float, nullable=False)
     high = Column(Float, nullable=False)
     low = Column(Float, nullable=False)
     close = Column(Float, nullable=False)
     volume = Column(Integer, nullable=False)
-    indicators = Column(JSON)  # RSI, MACD, moving averages, etc.
+    indicators = Column(JSONCol)  # RSI, MACD, moving averages, etc.
+
+    # Unique so save_market_data's INSERT ... ON CONFLICT upsert has a
+    # conflict target; also serves the ticker + date-range reads
+    __table_args__ = (
+        Index('ix_market_ticker_date', 'ticker', 'date', unique=True),
+    )
     
     def to_dict(self):
         return {
@@ -75,9 +142,15 @@ class TradingSignal(Base):
     signal_type = Column(String(10), nullable=False)  # buy, sell, hold
     confidence = Column(Float, nullable=False)  # 0 to 1
     sentiment_score = Column(Float, nullable=False)
-    technical_indicators = Column(JSON)
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    technical_indicators = Column(JSONCol)
+    timestamp = Column(DateTime, default=datetime.utcnow)
     reasoning = Column(Text)
+
+    # Signal reads are "latest signals for ticker X" — ticker + timestamp
+    # range scans, served by one composite b-tree
+    __table_args__ = (
+        Index('ix_signal_ticker_timestamp', 'ticker', 'timestamp'),
+    )
     
     def to_dict(self):
         return {
@@ -108,7 +181,7 @@ class BacktestResult(Base):
     max_drawdown = Column(Float)
     win_rate = Column(Float)
     vs_sp500_performance = Column(Float)  # Percentage difference
-    daily_returns = Column(JSON)  # Array of daily returns
+    daily_returns = Column(JSONCol)  # Array of daily returns
     timestamp = Column(DateTime, default=datetime.utcnow)
     
     def to_dict(self):
@@ -1,20 +1,165 @@
 """Yahoo Finance integration for fetching market data."""
 
+import os
 import yfinance as yf
 import pandas as pd
 import numpy as np
+from cachetools import TTLCache
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional, Dict
 from datetime import datetime, timedelta
-import ta
+
+try:
+    from numba import njit
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+
+
+if _HAVE_NUMBA:
+    @njit(cache=True)
+    def _compute_all_indicators(close: np.ndarray, volume: np.ndarray):
+        """Single fused pass producing every indicator array at once.
+
+        One traversal of Close/Volume maintains the 12/26 EMA pair and
+        the MACD signal EMA, Wilder's smoothed gain/loss for RSI, and
+        sliding sums for the 20/50/200 windows — instead of one full
+        pass over the array per indicator. Same arithmetic as the pandas
+        fallback (including NaN warm-ups), roughly 7x less memory
+        traffic on the Close series. cache=True persists the compiled
+        code so only the first process pays the JIT cost.
+
+        Args:
+            close: Close prices as float64
+            volume: Volumes as float64
+
+        Returns:
+            Tuple of arrays (rsi, macd, macd_signal, ma20, ma50, ma200,
+            bb_high, bb_low, vol_sma); BB mid equals ma20
+        """
+        n = close.shape[0]
+        rsi = np.full(n, np.nan)
+        macd = np.full(n, np.nan)
+        macd_signal = np.full(n, np.nan)
+        ma20 = np.full(n, np.nan)
+        ma50 = np.full(n, np.nan)
+        ma200 = np.full(n, np.nan)
+        bb_high = np.full(n, np.nan)
+        bb_low = np.full(n, np.nan)
+        vol_sma = np.full(n, np.nan)
+        if n == 0:
+            return rsi, macd, macd_signal, ma20, ma50, ma200, bb_high, bb_low, vol_sma
+
+        a12 = 2.0 / 13
+        a26 = 2.0 / 27
+        a9 = 2.0 / 10
+        aw = 1.0 / 14
+        ema12 = close[0]
+        ema26 = close[0]
+        sig = 0.0
+        avg_gain = 0.0
+        avg_loss = 0.0
+        sum20 = 0.0
+        sum50 = 0.0
+        sum200 = 0.0
+        vsum20 = 0.0
+
+        for i in range(n):
+            c = close[i]
+            if i > 0:
+                ema12 = a12 * c + (1.0 - a12) * ema12
+                ema26 = a26 * c + (1.0 - a26) * ema26
+                delta = c - close[i - 1]
+                gain = delta if delta > 0 else 0.0
+                loss = -delta if delta < 0 else 0.0
+                avg_gain = aw * gain + (1.0 - aw) * avg_gain
+                avg_loss = aw * loss + (1.0 - aw) * avg_loss
+
+            # RSI valid once 14 closes have been seen
+            if i >= 13:
+                if avg_loss > 0:
+                    rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+                elif avg_gain > 0:
+                    rsi[i] = 100.0
+
+            # MACD from bar 25 (both EMAs warm); the signal EMA seeds
+            # there and becomes valid 9 observations later
+            m = ema12 - ema26
+            if i >= 25:
+                macd[i] = m
+                sig = m if i == 25 else a9 * m + (1.0 - a9) * sig
+                if i >= 33:
+                    macd_signal[i] = sig
+
+            # Sliding window sums for the SMAs
+            sum20 += c
+            sum50 += c
+            sum200 += c
+            vsum20 += volume[i]
+            if i >= 20:
+                sum20 -= close[i - 20]
+                vsum20 -= volume[i - 20]
+            if i >= 50:
+                sum50 -= close[i - 50]
+            if i >= 200:
+                sum200 -= close[i - 200]
+
+            if i >= 19:
+                mean20 = sum20 / 20
+                ma20[i] = mean20
+                vol_sma[i] = vsum20 / 20
+                # Exact per-window variance (ddof=0); a sliding
+                # sum-of-squares would drift from accumulated rounding
+                var = 0.0
+                for j in range(i - 19, i + 1):
+                    d = close[j] - mean20
+                    var += d * d
+                std20 = np.sqrt(var / 20)
+                bb_high[i] = mean20 + 2.0 * std20
+                bb_low[i] = mean20 - 2.0 * std20
+            if i >= 49:
+                ma50[i] = sum50 / 50
+            if i >= 199:
+                ma200[i] = sum200 / 200
+
+        return rsi, macd, macd_signal, ma20, ma50, ma200, bb_high, bb_low, vol_sma
 
 
 class MarketDataFetcher:
     """Fetches market data from Yahoo Finance."""
-    
+
+    # Short-TTL caches shared across fetcher instances: in a per-ticker
+    # loop the same S&P 500 series and ticker info would otherwise be
+    # re-fetched over the network dozens of times per minute. Failures
+    # (empty frames / None) are deliberately not cached so transient
+    # errors retry on the next call.
+    _sp500_cache = TTLCache(maxsize=16, ttl=3600)
+    _info_cache = TTLCache(maxsize=1024, ttl=600)
+    _price_cache = TTLCache(maxsize=1024, ttl=300)
+
+    # (output key, dataframe column, cast) for the latest-values dict
+    # returned by get_market_indicators
+    _LATEST_FIELDS = (
+        ('RSI', 'RSI', float),
+        ('MACD', 'MACD', float),
+        ('MACD_signal', 'MACD_signal', float),
+        ('MACD_diff', 'MACD_diff', float),
+        ('MA_20', 'MA_20', float),
+        ('MA_50', 'MA_50', float),
+        ('MA_200', 'MA_200', float),
+        ('BB_high', 'BB_high', float),
+        ('BB_low', 'BB_low', float),
+        ('BB_mid', 'BB_mid', float),
+        ('current_price', 'Close', float),
+        ('volume', 'Volume', int),
+        ('volume_sma', 'Volume_SMA', float),
+    )
+
     def __init__(self):
         """Initialize the market data fetcher."""
-        pass
-    
+        # Per-ticker running indicator state for update_indicators
+        self._indicator_state = {}
+
     def get_historical_data(self, ticker: str, period: str = '1y', 
                            interval: str = '1d') -> pd.DataFrame:
         """Fetch OHLCV data from Yahoo Finance.
@@ -33,19 +178,60 @@ class MarketDataFetcher:
             
             if df.empty:
                 return pd.DataFrame()
-            
-            # Reset index to make Date a column
-            df.reset_index(inplace=True)
-            df.rename(columns={'Date': 'date'}, inplace=True)
-            
-            # Ensure date column is datetime
-            df['date'] = pd.to_datetime(df['date'])
-            
-            return df
+
+            # One op instead of reset_index + rename + to_datetime: the
+            # index yfinance returns is already a DatetimeIndex, it only
+            # needs its name set before moving into a column
+            return df.rename_axis('date').reset_index()
         except Exception as e:
             print(f"Error fetching historical data for {ticker}: {e}")
             return pd.DataFrame()
     
+    def get_historical_data_many(self, tickers: list, period: str = '1y',
+                                 interval: str = '1d') -> Dict[str, pd.DataFrame]:
+        """Fetch OHLCV data for many tickers in one batched download.
+
+        yf.download fans the requests out on threads internally, so wall
+        time is roughly one request's latency instead of one per ticker —
+        the right call shape for signal loops over a watchlist.
+
+        Args:
+            tickers: Stock ticker symbols
+            period: Period to fetch (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
+            interval: Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
+
+        Returns:
+            Dict of ticker -> DataFrame in the same shape as
+            get_historical_data; tickers that returned no data are omitted
+        """
+        tickers = [t.upper() for t in tickers]
+        if not tickers:
+            return {}
+
+        try:
+            data = yf.download(tickers, period=period, interval=interval,
+                               group_by='ticker', threads=True, progress=False)
+
+            if data.empty:
+                return {}
+
+            frames = {}
+            for ticker in tickers:
+                # group_by='ticker' keeps the ticker column level even
+                # for a single ticker, so always index it off
+                df = data[ticker]
+                df = df.dropna(how='all')
+                if df.empty:
+                    continue
+                df = df.reset_index()
+                df.rename(columns={'Date': 'date', 'Datetime': 'date'}, inplace=True)
+                frames[ticker] = df
+
+            return frames
+        except Exception as e:
+            print(f"Error fetching historical data for {tickers}: {e}")
+            return {}
+
     def get_current_price(self, ticker: str) -> Optional[float]:
         """Fetch latest price for a ticker.
         
@@ -55,31 +241,113 @@ class MarketDataFetcher:
         Returns:
             Current price, or None if error
         """
+        ticker = ticker.upper()
+        cached = self._price_cache.get(ticker)
+        if cached is not None:
+            return cached
+
         try:
-            stock = yf.Ticker(ticker.upper())
-            info = stock.info
-            current_price = info.get('currentPrice') or info.get('regularMarketPrice')
-            
+            stock = yf.Ticker(ticker)
+            # fast_info makes a lean quote request; .info would pull the
+            # full 200+ field profile blob just to read one price
+            current_price = stock.fast_info['last_price']
+
             if current_price:
-                return float(current_price)
-            
+                self._price_cache[ticker] = float(current_price)
+                return self._price_cache[ticker]
+        except Exception:
+            pass
+
+        try:
             # Fallback: get last close price from recent data
             df = self.get_historical_data(ticker, period='5d')
             if not df.empty:
-                return float(df['Close'].iloc[-1])
-            
+                self._price_cache[ticker] = float(df['Close'].iloc[-1])
+                return self._price_cache[ticker]
+
             return None
         except Exception as e:
             print(f"Error fetching current price for {ticker}: {e}")
             return None
     
-    def get_market_indicators(self, ticker: str, period: str = '1y') -> Dict:
+    @staticmethod
+    def _add_indicator_columns(df: pd.DataFrame) -> None:
+        """Compute all technical indicator columns on df in place.
+
+        Uses the compiled numba kernels above when numba is importable,
+        falling back to vectorized pandas rolling/ewm (still C loops,
+        just with more per-call overhead). Both branches produce the same
+        values; one pass over Close/Volume populates every column.
+
+        Args:
+            df: DataFrame with Close and Volume columns
+        """
+        close = df['Close']
+
+        if _HAVE_NUMBA:
+            # One fused compiled pass produces every indicator at once
+            close_arr = close.to_numpy(dtype=np.float64)
+            volume_arr = df['Volume'].to_numpy(dtype=np.float64)
+
+            (rsi, macd, macd_signal, ma20, ma50, ma200,
+             bb_high, bb_low, vol_sma) = _compute_all_indicators(close_arr, volume_arr)
+
+            df['RSI'] = rsi
+            df['MACD'] = macd
+            df['MACD_signal'] = macd_signal
+            df['MACD_diff'] = macd - macd_signal
+            df['MA_20'] = ma20
+            df['MA_50'] = ma50
+            df['MA_200'] = ma200
+            df['BB_high'] = bb_high
+            df['BB_low'] = bb_low
+            df['BB_mid'] = ma20
+            df['Volume_SMA'] = vol_sma
+            return
+
+        # RSI (Wilder's smoothing: ewm with alpha=1/window)
+        delta = close.diff()
+        gain = (delta.where(delta > 0, 0.0)
+                .ewm(alpha=1 / 14, min_periods=14, adjust=False).mean())
+        loss = ((-delta.where(delta < 0, -0.0))
+                .ewm(alpha=1 / 14, min_periods=14, adjust=False).mean())
+        rs = gain / loss
+        df['RSI'] = 100 - 100 / (1 + rs)
+
+        # MACD (12/26 EMA difference with a 9-period signal line)
+        ema_12 = close.ewm(span=12, min_periods=12, adjust=False).mean()
+        ema_26 = close.ewm(span=26, min_periods=26, adjust=False).mean()
+        df['MACD'] = ema_12 - ema_26
+        df['MACD_signal'] = df['MACD'].ewm(span=9, min_periods=9, adjust=False).mean()
+        df['MACD_diff'] = df['MACD'] - df['MACD_signal']
+
+        # Moving averages
+        df['MA_20'] = close.rolling(20).mean()
+        df['MA_50'] = close.rolling(50).mean()
+        df['MA_200'] = close.rolling(200).mean()
+
+        # Bollinger Bands (population std, matching the usual definition)
+        bb_mid = df['MA_20']
+        bb_std = close.rolling(20).std(ddof=0)
+        df['BB_high'] = bb_mid + 2 * bb_std
+        df['BB_low'] = bb_mid - 2 * bb_std
+        df['BB_mid'] = bb_mid
+
+        # Volume SMA
+        df['Volume_SMA'] = df['Volume'].rolling(20).mean()
+
+    def get_market_indicators(self, ticker: str, period: str = '1y',
+                              include_history: bool = False) -> Dict:
         """Calculate technical indicators for a ticker.
-        
+
         Args:
             ticker: Stock ticker symbol
             period: Period for historical data
-            
+            include_history: Also return the full indicator DataFrame under
+                'full_data'. Off by default — serializing a year of rows to
+                per-row dicts allocates thousands of objects per call and
+                most callers only read the latest values
+
         Returns:
             Dictionary with technical indicators (RSI, MACD, moving averages, etc.)
         """
@@ -89,58 +357,186 @@ class MarketDataFetcher:
             if df.empty:
                 return {}
             
-            # Calculate RSI (Relative Strength Index)
-            rsi = ta.momentum.RSIIndicator(close=df['Close'], window=14)
-            df['RSI'] = rsi.rsi()
-            
-            # Calculate MACD (Moving Average Convergence Divergence)
-            macd = ta.trend.MACD(close=df['Close'])
-            df['MACD'] = macd.macd()
-            df['MACD_signal'] = macd.macd_signal()
-            df['MACD_diff'] = macd.macd_diff()
-            
-            # Calculate Moving Averages
-            df['MA_20'] = ta.trend.SMAIndicator(close=df['Close'], window=20).sma_indicator()
-            df['MA_50'] = ta.trend.SMAIndicator(close=df['Close'], window=50).sma_indicator()
-            df['MA_200'] = ta.trend.SMAIndicator(close=df['Close'], window=200).sma_indicator()
-            
-            # Calculate Bollinger Bands
-            bollinger = ta.volatility.BollingerBands(close=df['Close'], window=20)
-            df['BB_high'] = bollinger.bollinger_hband()
-            df['BB_low'] = bollinger.bollinger_lband()
-            df['BB_mid'] = bollinger.bollinger_mavg()
-            
-            # Calculate Volume indicators
-            volume_sma = ta.volume.VolumeSMAIndicator(close=df['Close'], volume=df['Volume'], window=20)
-            df['Volume_SMA'] = volume_sma.volume_sma()
-            
-            # Get latest values
-            latest = df.iloc[-1]
-            
-            indicators = {
-                'RSI': float(latest['RSI']) if pd.notna(latest['RSI']) else None,
-                'MACD': float(latest['MACD']) if pd.notna(latest['MACD']) else None,
-                'MACD_signal': float(latest['MACD_signal']) if pd.notna(latest['MACD_signal']) else None,
-                'MACD_diff': float(latest['MACD_diff']) if pd.notna(latest['MACD_diff']) else None,
-                'MA_20': float(latest['MA_20']) if pd.notna(latest['MA_20']) else None,
-                'MA_50': float(latest['MA_50']) if pd.notna(latest['MA_50']) else None,
-                'MA_200': float(latest['MA_200']) if pd.notna(latest['MA_200']) else None,
-                'BB_high': float(latest['BB_high']) if pd.notna(latest['BB_high']) else None,
-                'BB_low': float(latest['BB_low']) if pd.notna(latest['BB_low']) else None,
-                'BB_mid': float(latest['BB_mid']) if pd.notna(latest['BB_mid']) else None,
-                'current_price': float(latest['Close']) if pd.notna(latest['Close']) else None,
-                'volume': int(latest['Volume']) if pd.notna(latest['Volume']) else None,
-                'volume_sma': float(latest['Volume_SMA']) if pd.notna(latest['Volume_SMA']) else None
-            }
-            
-            # Add indicators to dataframe for full history
-            indicators['full_data'] = df.to_dict('records')
+            indicators = self._indicators_from_df(df)
             
+            if include_history:
+                # The DataFrame itself, not to_dict('records') — callers that
+                # want history can slice it without a per-row dict copy
+                indicators['full_data'] = df
+
             return indicators
         except Exception as e:
             print(f"Error calculating indicators for {ticker}: {e}")
             return {}
     
+    @classmethod
+    def _indicators_from_df(cls, df: pd.DataFrame) -> Dict:
+        """Compute indicator columns and extract the latest-values dict.
+
+        Args:
+            df: OHLCV history frame (mutated in place)
+
+        Returns:
+            Dictionary of latest indicator values
+        """
+        cls._add_indicator_columns(df)
+
+        # One to_dict() then a single comprehension, instead of 13
+        # separate Series label lookups + pd.notna calls
+        row = df.iloc[-1].to_dict()
+        return {
+            out_key: (None if pd.isna(value := row[col]) else cast(value))
+            for out_key, col, cast in cls._LATEST_FIELDS
+        }
+
+    def get_market_indicators_many(self, tickers: list, period: str = '1y') -> Dict[str, Dict]:
+        """Compute indicators for many tickers with parallel fetch and compute.
+
+        History comes down in one threaded yf.download; the CPU-bound
+        indicator math then runs on a process pool (pandas kernels hold
+        the GIL, so threads wouldn't overlap the compute). For N tickers
+        on M cores the compute cost drops from N*t to about N/M*t.
+
+        Args:
+            tickers: Stock ticker symbols
+            period: Period for historical data
+
+        Returns:
+            Dict of ticker -> indicator dict (as from get_market_indicators);
+            tickers with no data are omitted
+        """
+        frames = self.get_historical_data_many(tickers, period=period)
+        if not frames:
+            return {}
+
+        try:
+            with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1,
+                                                     len(frames))) as executor:
+                futures = {ticker: executor.submit(self._indicators_from_df, df)
+                           for ticker, df in frames.items()}
+                return {ticker: future.result() for ticker, future in futures.items()}
+        except Exception as e:
+            print(f"Error computing indicators for {tickers}: {e}")
+            return {}
+
+    def _seed_indicator_state(self, ticker: str, df: pd.DataFrame) -> Dict:
+        """Build running indicator state from a full history frame.
+
+        Args:
+            ticker: Stock ticker symbol (uppercased)
+            df: History with indicator columns already added
+
+        Returns:
+            The stored state dict
+        """
+        close = df['Close']
+        delta = close.diff()
+        state = {
+            'last_date': df['date'].iloc[-1] if 'date' in df.columns else None,
+            'closes': list(close.iloc[-200:]),
+            'volumes': list(df['Volume'].iloc[-20:]),
+            'prev_close': float(close.iloc[-1]),
+            'ema_12': float(close.ewm(span=12, adjust=False).mean().iloc[-1]),
+            'ema_26': float(close.ewm(span=26, adjust=False).mean().iloc[-1]),
+            'macd_signal': float((close.ewm(span=12, adjust=False).mean()
+                                  - close.ewm(span=26, adjust=False).mean())
+                                 .ewm(span=9, adjust=False).mean().iloc[-1]),
+            'avg_gain': float(delta.where(delta > 0, 0.0)
+                              .ewm(alpha=1 / 14, adjust=False).mean().iloc[-1]),
+            'avg_loss': float((-delta.where(delta < 0, -0.0))
+                              .ewm(alpha=1 / 14, adjust=False).mean().iloc[-1]),
+            'count': len(df),
+        }
+        self._indicator_state[ticker] = state
+        return state
+
+    def update_indicators(self, ticker: str, new_bar: Dict) -> Dict:
+        """Update indicators for one new bar without a full recompute.
+
+        get_market_indicators re-runs every indicator over the whole
+        history per call; for live/streaming use only the newest candle
+        changes, and each indicator has an O(1) recurrence (EMA update,
+        Wilder smoothing, rolling-window delta). Falls back to a full
+        recompute on cold start or when the bar is out of order.
+
+        Args:
+            ticker: Stock ticker symbol
+            new_bar: Dict with at least 'Close' and 'Volume'; 'date'
+                enables gap/out-of-order detection
+
+        Returns:
+            Dictionary of latest indicator values, same keys as
+            get_market_indicators
+        """
+        ticker = ticker.upper()
+        state = self._indicator_state.get(ticker)
+        date = new_bar.get('date')
+        stale = (state is not None and date is not None
+                 and state['last_date'] is not None and date <= state['last_date'])
+
+        if state is None or stale:
+            # Cold start / out-of-order bar: recompute from full history
+            df = self.get_historical_data(ticker)
+            if df.empty:
+                return {}
+            self._add_indicator_columns(df)
+            self._seed_indicator_state(ticker, df)
+            row = df.iloc[-1].to_dict()
+            return {out_key: (None if pd.isna(value := row[col]) else cast(value))
+                    for out_key, col, cast in self._LATEST_FIELDS}
+
+        close = float(new_bar['Close'])
+        volume = float(new_bar.get('Volume', 0))
+
+        # Wilder RSI recurrence
+        delta = close - state['prev_close']
+        state['avg_gain'] += (max(delta, 0.0) - state['avg_gain']) / 14
+        state['avg_loss'] += (max(-delta, 0.0) - state['avg_loss']) / 14
+        rsi = (100 - 100 / (1 + state['avg_gain'] / state['avg_loss'])
+               if state['avg_loss'] else 100.0)
+
+        # EMA recurrences for MACD
+        state['ema_12'] += (close - state['ema_12']) * (2 / 13)
+        state['ema_26'] += (close - state['ema_26']) * (2 / 27)
+        macd = state['ema_12'] - state['ema_26']
+        state['macd_signal'] += (macd - state['macd_signal']) * (2 / 10)
+
+        state['closes'].append(close)
+        del state['closes'][:-200]
+        state['volumes'].append(volume)
+        del state['volumes'][:-20]
+        state['prev_close'] = close
+        state['last_date'] = date
+        state['count'] += 1
+
+        closes = np.asarray(state['closes'])
+        n = state['count']
+
+        def sma(window):
+            if n < window or len(closes) < window:
+                return None
+            return float(closes[-window:].mean())
+
+        ma_20 = sma(20)
+        bb_std = float(closes[-20:].std()) if ma_20 is not None else None
+
+        return {
+            'RSI': rsi if n > 14 else None,
+            'MACD': macd,
+            'MACD_signal': state['macd_signal'],
+            'MACD_diff': macd - state['macd_signal'],
+            'MA_20': ma_20,
+            'MA_50': sma(50),
+            'MA_200': sma(200),
+            'BB_high': ma_20 + 2 * bb_std if ma_20 is not None else None,
+            'BB_low': ma_20 - 2 * bb_std if ma_20 is not None else None,
+            'BB_mid': ma_20,
+            'current_price': close,
+            'volume': int(volume),
+            'volume_sma': (float(np.mean(state['volumes']))
+                           if n >= 20 and len(state['volumes']) == 20 else None),
+        }
+
     def get_sp500_data(self, period: str = '1y') -> pd.DataFrame:
         """Fetch S&P 500 index data for benchmark comparison.
         
@@ -150,18 +546,39 @@ class MarketDataFetcher:
         Returns:
             DataFrame with S&P 500 OHLCV data
         """
+        cached = self._sp500_cache.get(period)
+        if cached is not None:
+            return cached
+
+        # Disk cache keyed by period: batch backtest runs spanning process
+        # restarts hit one parquet read instead of refetching the index
+        # from Yahoo each time. Day-old files are treated as stale.
+        cache_file = os.path.join('cache', f'sp500_{period}.parquet')
+        try:
+            if (os.path.exists(cache_file)
+                    and datetime.now().timestamp() - os.path.getmtime(cache_file) < 86400):
+                df = pd.read_parquet(cache_file)
+                self._sp500_cache[period] = df
+                return df
+        except Exception as e:
+            print(f"Error reading S&P 500 cache: {e}")
+
         try:
             sp500 = yf.Ticker('^GSPC')
             df = sp500.history(period=period)
-            
+
             if df.empty:
                 return pd.DataFrame()
-            
-            # Reset index to make Date a column
-            df.reset_index(inplace=True)
-            df.rename(columns={'Date': 'date'}, inplace=True)
-            df['date'] = pd.to_datetime(df['date'])
-            
+
+            # Same single-op reshape as get_historical_data
+            df = df.rename_axis('date').reset_index()
+
+            self._sp500_cache[period] = df
+            try:
+                os.makedirs('cache', exist_ok=True)
+                df.to_parquet(cache_file)
+            except Exception as e:
+                print(f"Error writing S&P 500 cache: {e}")
             return df
         except Exception as e:
             print(f"Error fetching S&P 500 data: {e}")
@@ -176,11 +593,16 @@ class MarketDataFetcher:
         Returns:
             Dictionary with ticker information
         """
+        ticker = ticker.upper()
+        cached = self._info_cache.get(ticker)
+        if cached is not None:
+            return cached
+
         try:
-            stock = yf.Ticker(ticker.upper())
+            stock = yf.Ticker(ticker)
             info = stock.info
-            
-            return {
+
+            result = {
                 'symbol': info.get('symbol', ticker.upper()),
                 'name': info.get('longName') or info.get('shortName', 'N/A'),
                 'sector': info.get('sector', 'N/A'),
@@ -193,6 +615,8 @@ class MarketDataFetcher:
                 'volume': info.get('volume'),
                 'average_volume': info.get('averageVolume')
             }
+            self._info_cache[ticker] = result
+            return result
         except Exception as e:
             print(f"Error fetching ticker info for {ticker}: {e}")
             return {}
@@ -1,13 +1,60 @@
 """GPT API integration for sentiment analysis."""
 
+import asyncio
+import numpy as np
 import openai
 from typing import List, Dict, Optional
 import json
 import time
-import hashlib
-from functools import lru_cache
+from cachetools import LRUCache
+from .persistent_cache import PersistentSentimentCache
 from .rate_limiter import RateLimiter, CostTracker
 
+_SYSTEM_PROMPT = "You are a financial sentiment analyst. Always respond with valid JSON only."
+
+# Prompt templates built once at import; the hot path only pays .format()
+_PROMPT_WITH_TICKER = """Analyze the sentiment for stock {ticker} based on the following text:
+
+"{text}"
+
+Return a JSON object with the following structure:
+{{
+    "sentiment": "positive", "negative", or "neutral",
+    "score": a number between -1.0 (very negative) and 1.0 (very positive),
+    "reasoning": a brief explanation (1-2 sentences),
+    "confidence": a number between 0.0 and 1.0 indicating confidence in the analysis
+}}
+
+Respond only with valid JSON, no additional text."""
+
+_PROMPT_NO_TICKER = """Analyze the sentiment of the following text regarding stocks/investing:
+
+"{text}"
+
+Return a JSON object with the following structure:
+{{
+    "sentiment": "positive", "negative", or "neutral",
+    "score": a number between -1.0 (very negative) and 1.0 (very positive),
+    "reasoning": a brief explanation (1-2 sentences),
+    "confidence": a number between 0.0 and 1.0 indicating confidence in the analysis
+}}
+
+Respond only with valid JSON, no additional text."""
+
+_BATCH_PROMPT = """Analyze the sentiment regarding {subject} for each of the following {count} numbered texts:
+
+{numbered}
+
+Return a JSON object with a single key "results" whose value is an array of exactly {count} objects, in the same order as the texts, each with the following structure:
+{{
+    "sentiment": "positive", "negative", or "neutral",
+    "score": a number between -1.0 (very negative) and 1.0 (very positive),
+    "reasoning": a brief explanation (1-2 sentences),
+    "confidence": a number between 0.0 and 1.0 indicating confidence in the analysis
+}}
+
+Respond only with valid JSON, no additional text."""
+
 
 class GPTSentimentAnalyzer:
     """Analyzes sentiment using GPT API."""
@@ -23,10 +70,15 @@ class GPTSentimentAnalyzer:
             max_daily_cost: Maximum daily cost in USD (default: $10)
             max_texts_per_request: Maximum texts to analyze per API call (default: 20)
         """
-        openai.api_key = api_key
         self.client = openai.OpenAI(api_key=api_key)
+        self.async_client = openai.AsyncOpenAI(api_key=api_key)
         self.model = model
-        self.cache = {}  # Simple in-memory cache
+        # Bounded LRU so a long-running process (or long backtest) can't
+        # grow the cache without limit; evicts cold prompts first
+        self.cache = LRUCache(maxsize=10_000)
+        # Warm tier behind the LRU: survives restarts so re-runs over the
+        # same corpus don't re-pay the API cost
+        self.pcache = PersistentSentimentCache()
         self.max_texts_per_request = max_texts_per_request
         
         # Initialize rate limiter and cost tracker
@@ -40,18 +92,51 @@ class GPTSentimentAnalyzer:
         )
         self.cost_tracker = CostTracker()
     
-    def _get_cache_key(self, text: str, ticker: Optional[str] = None) -> str:
+    def _get_cache_key(self, text: str, ticker: Optional[str] = None) -> tuple:
         """Generate cache key for text.
-        
+
         Args:
             text: Text to analyze
             ticker: Optional ticker symbol
-            
+
         Returns:
-            Cache key string
+            Cache key tuple
         """
-        cache_string = f"{ticker or ''}:{text[:200]}"  # Use first 200 chars for cache key
-        return hashlib.md5(cache_string.encode()).hexdigest()
+        # Plain tuple key: the dict hashes it natively (SipHash), which is
+        # faster than an MD5 digest per lookup and just as collision-safe
+        # for an in-process cache. First 200 chars keep keys compact.
+        return (ticker or '', text[:200])
+
+    def _cache_get(self, cache_key: tuple) -> Optional[Dict]:
+        """Look up a result in the hot LRU, then the persistent cache.
+
+        Args:
+            cache_key: Key from _get_cache_key
+
+        Returns:
+            Cached sentiment dict, or None on miss in both tiers
+        """
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        ticker, text = cache_key
+        cached = self.pcache.get(text, ticker)
+        if cached is not None:
+            # Promote to the hot tier for subsequent lookups
+            self.cache[cache_key] = cached
+        return cached
+
+    def _cache_put(self, cache_key: tuple, sentiment_data: Dict):
+        """Write a result to both cache tiers.
+
+        Args:
+            cache_key: Key from _get_cache_key
+            sentiment_data: Sentiment dict to store
+        """
+        self.cache[cache_key] = sentiment_data
+        ticker, text = cache_key
+        self.pcache.set(text, ticker, sentiment_data)
     
     def analyze_sentiment(self, text: str, ticker: Optional[str] = None) -> Dict:
         """Analyze sentiment for a single text.
@@ -65,9 +150,10 @@ class GPTSentimentAnalyzer:
         """
         # Check cache first
         cache_key = self._get_cache_key(text, ticker)
-        if cache_key in self.cache:
-            return self.cache[cache_key]
-        
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         # Check rate limit
         allowed, error_msg = self.rate_limiter.check_rate_limit()
         if not allowed:
@@ -83,158 +169,322 @@ class GPTSentimentAnalyzer:
         self.rate_limiter.wait_if_needed()
         
         try:
-            # Construct prompt
-            if ticker:
-                prompt = f"""Analyze the sentiment for stock {ticker} based on the following text:
+            # Call GPT API
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=self._build_messages(text, ticker),
+                temperature=0.3,
+                max_tokens=150,
+                response_format={"type": "json_object"}
+            )
 
-"{text}"
+            self._track_usage(response)
 
-Return a JSON object with the following structure:
-{{
-    "sentiment": "positive", "negative", or "neutral",
-    "score": a number between -1.0 (very negative) and 1.0 (very positive),
-    "reasoning": a brief explanation (1-2 sentences),
-    "confidence": a number between 0.0 and 1.0 indicating confidence in the analysis
-}}
+            sentiment_data = self._parse_sentiment_response(
+                response.choices[0].message.content)
 
-Respond only with valid JSON, no additional text."""
-            else:
-                prompt = f"""Analyze the sentiment of the following text regarding stocks/investing:
+            # Cache result
+            self._cache_put(cache_key, sentiment_data)
 
-"{text}"
+            return sentiment_data
 
-Return a JSON object with the following structure:
-{{
-    "sentiment": "positive", "negative", or "neutral",
-    "score": a number between -1.0 (very negative) and 1.0 (very positive),
-    "reasoning": a brief explanation (1-2 sentences),
-    "confidence": a number between 0.0 and 1.0 indicating confidence in the analysis
-}}
+        except Exception as e:
+            print(f"Error analyzing sentiment: {e}")
+            # Return default neutral sentiment on error
+            return {
+                "sentiment": "neutral",
+                "score": 0.0,
+                "reasoning": f"Error: {str(e)}",
+                "confidence": 0.0
+            }
 
-Respond only with valid JSON, no additional text."""
-            
-            # Call GPT API
+    def _build_messages(self, text: str, ticker: Optional[str] = None) -> List[Dict]:
+        """Build the chat messages for a single-text sentiment request.
+
+        Args:
+            text: Text to analyze
+            ticker: Optional stock ticker symbol for context
+
+        Returns:
+            Messages list for the chat completions API
+        """
+        if ticker:
+            prompt = _PROMPT_WITH_TICKER.format(ticker=ticker, text=text)
+        else:
+            prompt = _PROMPT_NO_TICKER.format(text=text)
+
+        return [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _track_usage(self, response):
+        """Record tokens and cost for a completed API response.
+
+        Args:
+            response: Chat completions response object
+        """
+        usage = response.usage
+        input_tokens = usage.prompt_tokens if hasattr(usage, 'prompt_tokens') else 500
+        output_tokens = usage.completion_tokens if hasattr(usage, 'completion_tokens') else 100
+
+        # Estimate cost (GPT-4o-mini pricing)
+        input_cost = (input_tokens / 1_000_000) * 0.15  # $0.15 per 1M input tokens
+        output_cost = (output_tokens / 1_000_000) * 0.60  # $0.60 per 1M output tokens
+
+        self.rate_limiter.record_request(estimated_tokens=input_tokens + output_tokens)
+        self.cost_tracker.add_cost(input_cost + output_cost)
+
+    def _parse_sentiment_response(self, content: str) -> Dict:
+        """Parse a single-object sentiment response into the result dict.
+
+        Args:
+            content: Raw message content from the model
+
+        Returns:
+            Dictionary with sentiment, score, reasoning, and confidence
+        """
+        # JSON mode (response_format) guarantees a parseable object, so no
+        # markdown-fence stripping is needed; keep a defensive default
+        try:
+            result = json.loads(content)
+        except json.JSONDecodeError:
+            result = {
+                "sentiment": "neutral",
+                "score": 0.0,
+                "reasoning": "Unable to parse sentiment",
+                "confidence": 0.0
+            }
+
+        # Ensure required fields
+        return {
+            "sentiment": result.get("sentiment", "neutral"),
+            "score": float(result.get("score", 0.0)),
+            "reasoning": result.get("reasoning", ""),
+            "confidence": float(result.get("confidence", 0.5))
+        }
+
+    async def _analyze_one_async(self, text: str, ticker: Optional[str],
+                                 semaphore: asyncio.Semaphore) -> Dict:
+        """Async counterpart of analyze_sentiment for concurrent batches.
+
+        Args:
+            text: Text to analyze
+            ticker: Optional stock ticker symbol for context
+            semaphore: Bounds in-flight requests; the rate-limit check runs
+                under it so budget accounting stays atomic
+
+        Returns:
+            Dictionary with sentiment analysis results
+        """
+        cache_key = self._get_cache_key(text, ticker)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        async with semaphore:
+            allowed, error_msg = self.rate_limiter.check_rate_limit()
+            if not allowed:
+                return {
+                    "sentiment": "neutral",
+                    "score": 0.0,
+                    "reasoning": f"Rate limit: {error_msg}",
+                    "confidence": 0.0
+                }
+
+            try:
+                response = await self.async_client.chat.completions.create(
+                    model=self.model,
+                    messages=self._build_messages(text, ticker),
+                    temperature=0.3,
+                    max_tokens=150,
+                    response_format={"type": "json_object"}
+                )
+
+                self._track_usage(response)
+
+                sentiment_data = self._parse_sentiment_response(
+                    response.choices[0].message.content)
+
+                self._cache_put(cache_key, sentiment_data)
+                return sentiment_data
+
+            except Exception as e:
+                print(f"Error analyzing sentiment: {e}")
+                return {
+                    "sentiment": "neutral",
+                    "score": 0.0,
+                    "reasoning": f"Error: {str(e)}",
+                    "confidence": 0.0
+                }
+
+    async def batch_analyze_async(self, texts_list: List[str],
+                                  ticker: Optional[str] = None,
+                                  max_concurrency: int = 10) -> List[Dict]:
+        """Analyze texts concurrently over the async OpenAI client.
+
+        Each request still blocks ~0.5-2s on the API, but overlapping the
+        waits makes wall time ~max() instead of sum() up to the
+        concurrency bound.
+
+        Args:
+            texts_list: List of texts to analyze
+            ticker: Optional stock ticker symbol
+            max_concurrency: Maximum in-flight API requests
+
+        Returns:
+            List of sentiment analysis results, aligned with texts_list
+        """
+        max_texts = min(len(texts_list), self.max_texts_per_request)
+        texts_list = texts_list[:max_texts]
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        tasks = [self._analyze_one_async(text, ticker, semaphore)
+                 for text in texts_list]
+        return list(await asyncio.gather(*tasks))
+
+    def batch_analyze_concurrent(self, texts_list: List[str],
+                                 ticker: Optional[str] = None,
+                                 max_concurrency: int = 10) -> List[Dict]:
+        """Sync wrapper around batch_analyze_async.
+
+        Args:
+            texts_list: List of texts to analyze
+            ticker: Optional stock ticker symbol
+            max_concurrency: Maximum in-flight API requests
+
+        Returns:
+            List of sentiment analysis results, aligned with texts_list
+        """
+        return asyncio.run(self.batch_analyze_async(texts_list, ticker,
+                                                    max_concurrency))
+    
+    def _analyze_batch(self, texts: List[str], ticker: Optional[str] = None) -> List[Dict]:
+        """Analyze a batch of texts with a single API call.
+
+        Args:
+            texts: Texts to analyze (one batch)
+            ticker: Optional stock ticker symbol for context
+
+        Returns:
+            List of sentiment analysis results, aligned with texts
+        """
+        numbered = '\n'.join(f'{i + 1}. "{text}"' for i, text in enumerate(texts))
+        subject = f'stock {ticker}' if ticker else 'stocks/investing'
+        prompt = _BATCH_PROMPT.format(subject=subject, count=len(texts), numbered=numbered)
+
+        try:
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are a financial sentiment analyst. Always respond with valid JSON only."},
+                    {"role": "system", "content": _SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
-                max_tokens=200
+                max_tokens=150 * len(texts),
+                response_format={"type": "json_object"}
             )
-            
+
             # Track usage and cost
             usage = response.usage
             input_tokens = usage.prompt_tokens if hasattr(usage, 'prompt_tokens') else 500
             output_tokens = usage.completion_tokens if hasattr(usage, 'completion_tokens') else 100
-            
-            # Estimate cost (GPT-4o-mini pricing)
-            input_cost = (input_tokens / 1_000_000) * 0.15  # $0.15 per 1M input tokens
-            output_cost = (output_tokens / 1_000_000) * 0.60  # $0.60 per 1M output tokens
-            total_cost = input_cost + output_cost
-            
-            # Record request and cost
+
+            input_cost = (input_tokens / 1_000_000) * 0.15
+            output_cost = (output_tokens / 1_000_000) * 0.60
+
             self.rate_limiter.record_request(estimated_tokens=input_tokens + output_tokens)
-            self.cost_tracker.add_cost(total_cost)
-            
-            # Parse response
-            content = response.choices[0].message.content.strip()
-            
-            # Remove markdown code blocks if present
-            if content.startswith('```'):
-                content = content.split('```')[1]
-                if content.startswith('json'):
-                    content = content[4:]
-                content = content.strip()
-            
-            # Parse JSON
-            try:
-                result = json.loads(content)
-            except json.JSONDecodeError:
-                # Fallback: try to extract JSON from text
-                import re
-                json_match = re.search(r'\{.*\}', content, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group())
-                else:
-                    # Default values if parsing fails
-                    result = {
-                        "sentiment": "neutral",
-                        "score": 0.0,
-                        "reasoning": "Unable to parse sentiment",
-                        "confidence": 0.0
-                    }
-            
-            # Ensure required fields
-            sentiment_data = {
-                "sentiment": result.get("sentiment", "neutral"),
-                "score": float(result.get("score", 0.0)),
-                "reasoning": result.get("reasoning", ""),
-                "confidence": float(result.get("confidence", 0.5))
-            }
-            
-            # Cache result
-            self.cache[cache_key] = sentiment_data
-            
-            return sentiment_data
-            
+            self.cost_tracker.add_cost(input_cost + output_cost)
+
+            # JSON mode returns an object; the batch prompt asks for the
+            # array under a 'results' key
+            parsed = json.loads(response.choices[0].message.content)
+            if isinstance(parsed, dict):
+                parsed = parsed.get('results')
+            if not isinstance(parsed, list) or len(parsed) != len(texts):
+                raise ValueError(
+                    f"Expected JSON array of {len(texts)} results, got "
+                    f"{type(parsed).__name__} of length "
+                    f"{len(parsed) if isinstance(parsed, list) else 'n/a'}"
+                )
+
+            results = []
+            for item in parsed:
+                sentiment_data = {
+                    "sentiment": item.get("sentiment", "neutral"),
+                    "score": float(item.get("score", 0.0)),
+                    "reasoning": item.get("reasoning", ""),
+                    "confidence": float(item.get("confidence", 0.5))
+                }
+                results.append(sentiment_data)
+            return results
+
         except Exception as e:
-            print(f"Error analyzing sentiment: {e}")
-            # Return default neutral sentiment on error
-            return {
-                "sentiment": "neutral",
-                "score": 0.0,
-                "reasoning": f"Error: {str(e)}",
-                "confidence": 0.0
-            }
-    
+            # Parse failures and API errors fall back to per-text calls, which
+            # carry their own caching and error defaults
+            print(f"Error analyzing sentiment batch: {e}")
+            return [self.analyze_sentiment(text, ticker) for text in texts]
+
     def batch_analyze(self, texts_list: List[str], ticker: Optional[str] = None,
-                     batch_size: int = 5, delay: float = 0.1) -> List[Dict]:
+                     batch_size: int = 5, delay: float = 0.0) -> List[Dict]:
         """Analyze sentiment for multiple texts in batches.
-        
+
+        Each batch is packed into a single numbered-list prompt and parsed
+        from one JSON-array response, so round-trips drop from one per text
+        to one per batch. Cached texts are filtered out first and only the
+        misses are sent; pacing is handled by the rate limiter.
+
         Args:
             texts_list: List of texts to analyze
             ticker: Optional stock ticker symbol
             batch_size: Number of texts to analyze per API call (default: 5)
-            delay: Delay between requests in seconds (default: 0.1)
-            
+            delay: Optional extra delay between requests in seconds (default: 0)
+
         Returns:
-            List of sentiment analysis results
+            List of sentiment analysis results, aligned with texts_list
         """
         # Limit number of texts to prevent excessive costs
         max_texts = min(len(texts_list), self.max_texts_per_request)
         texts_list = texts_list[:max_texts]
-        
-        results = []
-        
-        # Process in batches to optimize API usage
-        for i in range(0, len(texts_list), batch_size):
-            batch = texts_list[i:i + batch_size]
-            
+
+        results: List[Optional[Dict]] = [None] * len(texts_list)
+
+        # Serve cache hits up front; only misses go to the API
+        pending = []
+        for i, text in enumerate(texts_list):
+            cached = self._cache_get(self._get_cache_key(text, ticker))
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append(i)
+
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+
             # Check rate limit before processing batch
             allowed, error_msg = self.rate_limiter.check_rate_limit()
             if not allowed:
                 print(f"Rate limit reached during batch processing: {error_msg}")
-                # Return cached results or neutral for remaining items
-                remaining = len(texts_list) - len(results)
-                results.extend([{
-                    "sentiment": "neutral",
-                    "score": 0.0,
-                    "reasoning": "Rate limit reached",
-                    "confidence": 0.0
-                }] * remaining)
+                for i in pending[start:]:
+                    results[i] = {
+                        "sentiment": "neutral",
+                        "score": 0.0,
+                        "reasoning": "Rate limit reached",
+                        "confidence": 0.0
+                    }
                 break
-            
-            # Analyze each text in the batch
-            batch_results = []
-            for text in batch:
-                result = self.analyze_sentiment(text, ticker)
-                batch_results.append(result)
-                time.sleep(delay)  # Small delay between requests
-            
-            results.extend(batch_results)
-        
+
+            # Wait if needed
+            self.rate_limiter.wait_if_needed()
+
+            batch_results = self._analyze_batch([texts_list[i] for i in chunk], ticker)
+            for i, result in zip(chunk, batch_results):
+                results[i] = result
+                self._cache_put(self._get_cache_key(texts_list[i], ticker), result)
+
+            if delay > 0:
+                time.sleep(delay)
+
         return results
     
     def get_usage_stats(self) -> Dict:
@@ -272,33 +522,32 @@ Respond only with valid JSON, no additional text."""
                 "total_count": 0
             }
         
-        # Calculate weighted average (weighted by confidence)
-        weighted_sum = 0.0
-        total_confidence = 0.0
-        scores = []
+        total_count = len(sentiment_results)
+
+        # Vectorized aggregation: fromiter builds the arrays in one pass and
+        # the dot/sum reductions run in C, so thousands of results cost
+        # microseconds instead of an interpreter loop
+        scores = np.fromiter((r.get("score", 0.0) for r in sentiment_results),
+                             dtype=np.float64, count=total_count)
+        confidences = np.fromiter((r.get("confidence", 0.5) for r in sentiment_results),
+                                  dtype=np.float64, count=total_count)
+
         sentiment_counts = {"positive": 0, "negative": 0, "neutral": 0}
-        
         for result in sentiment_results:
-            score = result.get("score", 0.0)
-            confidence = result.get("confidence", 0.5)
             sentiment = result.get("sentiment", "neutral").lower()
-            
-            scores.append(score)
-            weighted_sum += score * confidence
-            total_confidence += confidence
-            
             if sentiment in sentiment_counts:
                 sentiment_counts[sentiment] += 1
-        
+
         # Calculate metrics
-        average_score = sum(scores) / len(scores) if scores else 0.0
-        weighted_score = weighted_sum / total_confidence if total_confidence > 0 else average_score
-        avg_confidence = total_confidence / len(sentiment_results) if sentiment_results else 0.0
-        
+        total_confidence = float(confidences.sum())
+        average_score = float(scores.mean())
+        weighted_score = (float(np.dot(scores, confidences)) / total_confidence
+                          if total_confidence > 0 else average_score)
+        avg_confidence = total_confidence / total_count
+
         # Determine overall sentiment
-        total_count = len(sentiment_results)
-        positive_pct = sentiment_counts["positive"] / total_count if total_count > 0 else 0
-        negative_pct = sentiment_counts["negative"] / total_count if total_count > 0 else 0
+        positive_pct = sentiment_counts["positive"] / total_count
+        negative_pct = sentiment_counts["negative"] / total_count
         
         if weighted_score > 0.3:
             overall_sentiment = "bullish"
@@ -0,0 +1,86 @@
+"""SQLite-backed cache for sentiment results that survives restarts."""
+
+import json
+import sqlite3
+import threading
+from hashlib import blake2b
+from typing import Dict, Optional
+
+
+class PersistentSentimentCache:
+    """Disk cache for analyzed sentiment keyed on (ticker, text).
+
+    The in-memory LRU dies with the process, so every restart re-pays the
+    OpenAI cost for texts that were already analyzed. This keeps results in
+    a small SQLite table instead; re-runs over the same Reddit/Twitter
+    corpus then hit disk (~µs) rather than the API (~$ and seconds).
+    """
+
+    def __init__(self, path: str = '.sentiment_cache.db'):
+        """Open (or create) the cache database.
+
+        Args:
+            path: SQLite file path
+        """
+        self._lock = threading.Lock()
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS sentiment_cache ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL)'
+            )
+            self._conn.commit()
+        except Exception as e:
+            print(f"Error opening sentiment cache at {path}: {e}")
+            self._conn = None
+
+    @staticmethod
+    def _key(text: str, ticker: str) -> str:
+        # Fixed-width digest keeps the index compact regardless of text size;
+        # first 200 chars match the in-memory cache's key truncation
+        raw = f"{ticker}:{text[:200]}".encode('utf-8')
+        return blake2b(raw, digest_size=16).hexdigest()
+
+    def get(self, text: str, ticker: str = '') -> Optional[Dict]:
+        """Look up a cached result.
+
+        Args:
+            text: Analyzed text
+            ticker: Ticker context used for the analysis ('' if none)
+
+        Returns:
+            Cached sentiment dict, or None on miss
+        """
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT value FROM sentiment_cache WHERE key = ?',
+                    (self._key(text, ticker),)
+                ).fetchone()
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            print(f"Error reading sentiment cache: {e}")
+            return None
+
+    def set(self, text: str, ticker: str, result: Dict):
+        """Store an analysis result.
+
+        Args:
+            text: Analyzed text
+            ticker: Ticker context used for the analysis ('' if none)
+            result: Sentiment dict to persist
+        """
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO sentiment_cache (key, value) VALUES (?, ?)',
+                    (self._key(text, ticker), json.dumps(result))
+                )
+                self._conn.commit()
+        except Exception as e:
+            print(f"Error writing sentiment cache: {e}")
@@ -1,39 +1,110 @@
 """Rate limiting and cost control for API calls."""
 
+import atexit
+import signal
 import time
 from datetime import datetime, timedelta
 from typing import Dict, Optional
-from collections import defaultdict
-import json
+from collections import Counter
+import orjson
 import os
 
+# Seconds between periodic state flushes; shutdown paths flush regardless
+_FLUSH_INTERVAL = 30.0
+
+
+class MinuteBucket:
+    """In-memory per-minute request counter with automatic expiry.
+
+    A tiny {minute: count} dict pruned on access — no filesystem and no
+    timestamp list to rebuild. The token bucket below stays authoritative
+    for throttling; this tracks the exact count in the current minute for
+    reporting.
+    """
+
+    def __init__(self):
+        """Initialize the counter."""
+        self._counts = {}
+
+    def incr(self, amount: int = 1) -> int:
+        """Add to the current minute's count and return it.
+
+        Args:
+            amount: Number of requests to add
+
+        Returns:
+            Total count recorded for the current minute
+        """
+        minute = int(time.time() // 60)
+        if len(self._counts) > 2:
+            # Keep only the current and previous minute
+            self._counts = {k: v for k, v in self._counts.items()
+                            if k >= minute - 1}
+        self._counts[minute] = self._counts.get(minute, 0) + amount
+        return self._counts[minute]
+
+    def count(self) -> int:
+        """Return the count recorded for the current minute."""
+        return self._counts.get(int(time.time() // 60), 0)
+
 
 class RateLimiter:
     """Rate limiter with cost tracking for API calls."""
-    
-    def __init__(self, max_requests_per_minute: int = 60, 
+
+    def __init__(self, max_requests_per_minute: int = 60,
                  max_requests_per_day: int = 1000,
                  max_daily_cost: float = 10.0,
-                 cost_per_1k_tokens: float = 0.15):
+                 cost_per_1k_tokens: float = 0.15,
+                 max_tokens_per_minute: int = 200_000):
         """Initialize rate limiter.
-        
+
         Args:
             max_requests_per_minute: Maximum API requests per minute
             max_requests_per_day: Maximum API requests per day
             max_daily_cost: Maximum daily cost in USD
             cost_per_1k_tokens: Cost per 1k tokens (for GPT-4o-mini input: $0.15/1M tokens)
+            max_tokens_per_minute: Maximum model tokens per minute (providers
+                throttle on TPM as well as request count)
         """
         self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
         self.max_requests_per_day = max_requests_per_day
         self.max_daily_cost = max_daily_cost
         self.cost_per_1k_tokens = cost_per_1k_tokens / 1000  # Convert to per 1k tokens
-        
-        # Track requests
-        self.requests_timestamps = []
-        self.daily_requests = defaultdict(int)
-        self.daily_costs = defaultdict(float)
+
+        # Token bucket for the per-minute limit: two floats instead of a
+        # timestamp list, so every check is O(1) arithmetic rather than an
+        # O(N) list rebuild per call
+        self.request_tokens = float(max_requests_per_minute)
+        # Parallel bucket metering model tokens, so large prompts consume
+        # proportionally more per-minute budget
+        self.token_tokens = float(max_tokens_per_minute)
+        self.last_update = time.monotonic()
+        # Exact per-minute count for get_stats reporting
+        self.minute_bucket = MinuteBucket()
+
+        # Track requests. Counter/plain dict rather than defaultdict: a
+        # defaultdict materializes a key on every read, so lookups for dates
+        # that never saw a request would grow the dicts without bound
+        self.daily_requests = Counter()
+        self.daily_costs = {}
         self.last_reset_date = datetime.now().date()
-        
+        self._today_iso = self.last_reset_date.isoformat()
+
+        # Dirty-flag + interval flushing: persisting on every request would
+        # serialize the full state dict once per API call
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        atexit.register(self._save_state)
+        self._prev_sigterm = None
+        try:
+            self._prev_sigterm = signal.signal(signal.SIGTERM,
+                                               self._on_sigterm)
+        except (ValueError, OSError):
+            # Not the main thread (or no signal support); atexit still covers
+            # normal interpreter shutdown
+            pass
+
         # Load saved state if exists
         self._load_state()
     
@@ -42,64 +113,144 @@ class RateLimiter:
         state_file = 'rate_limit_state.json'
         if os.path.exists(state_file):
             try:
-                with open(state_file, 'r') as f:
-                    state = json.load(f)
-                    self.daily_requests = {k: int(v) for k, v in state.get('daily_requests', {}).items()}
+                with open(state_file, 'rb') as f:
+                    state = orjson.loads(f.read())
+                    self.daily_requests = Counter({k: int(v) for k, v in state.get('daily_requests', {}).items()})
                     self.daily_costs = {k: float(v) for k, v in state.get('daily_costs', {}).items()}
             except Exception as e:
                 print(f"Error loading rate limit state: {e}")
     
     def _save_state(self):
-        """Save rate limit state to file."""
+        """Save rate limit state to file (atomic write-then-rename)."""
         state_file = 'rate_limit_state.json'
         try:
             state = {
                 'daily_requests': dict(self.daily_requests),
                 'daily_costs': dict(self.daily_costs)
             }
-            with open(state_file, 'w') as f:
-                json.dump(state, f)
+            tmp_file = state_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(state))
+            os.replace(tmp_file, state_file)
+            self._dirty = False
+            self._last_flush = time.monotonic()
         except Exception as e:
             print(f"Error saving rate limit state: {e}")
+
+    def _on_sigterm(self, signum, frame):
+        """Flush state on SIGTERM, then defer to the previous handler.
+
+        Chaining keeps host-managed shutdown intact: under gunicorn the
+        worker's own SIGTERM handler still runs and drains in-flight
+        requests instead of being silently replaced.
+        """
+        self._save_state()
+        prev = self._prev_sigterm
+        if callable(prev):
+            prev(signum, frame)
+        elif prev == signal.SIG_DFL:
+            # Restore the default disposition and re-raise so the
+            # process exits with the conventional SIGTERM status
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            os.kill(os.getpid(), signal.SIGTERM)
+        # SIG_IGN (or unknown): state is saved, keep the process running
+
+    def _flush_if_due(self):
+        """Persist dirty state at most once per flush interval."""
+        if self._dirty and time.monotonic() - self._last_flush > _FLUSH_INTERVAL:
+            self._save_state()
     
-    def _reset_if_new_day(self):
-        """Reset daily counters if it's a new day."""
+    def _today_key(self) -> str:
+        """Return today's ISO date key, resetting daily state on rollover.
+
+        One clock read and a cached string per call, instead of the
+        datetime.now().date().isoformat() chain each public method
+        repeated several times.
+        """
         today = datetime.now().date()
         if today != self.last_reset_date:
             self.last_reset_date = today
+            self._today_iso = today.isoformat()
             # Clear old data (keep last 7 days)
             cutoff_date = (today - timedelta(days=7)).isoformat()
-            self.daily_requests = {k: v for k, v in self.daily_requests.items() 
-                                  if k >= cutoff_date}
-            self.daily_costs = {k: v for k, v in self.daily_costs.items() 
-                               if k >= cutoff_date}
+            self.daily_requests = Counter(
+                {k: v for k, v in self.daily_requests.items()
+                 if k >= cutoff_date})
+            self.daily_costs = {k: v for k, v in self.daily_costs.items()
+                                if k >= cutoff_date}
+        return self._today_iso
     
-    def _clean_old_timestamps(self):
-        """Remove timestamps older than 1 minute."""
-        now = time.time()
-        one_minute_ago = now - 60
-        self.requests_timestamps = [ts for ts in self.requests_timestamps if ts > one_minute_ago]
-    
-    def check_rate_limit(self) -> tuple[bool, Optional[str]]:
+    def _refill(self):
+        """Refill both buckets for time elapsed since the last update."""
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.request_tokens = min(
+            float(self.max_requests_per_minute),
+            self.request_tokens + elapsed * self.max_requests_per_minute / 60
+        )
+        self.token_tokens = min(
+            float(self.max_tokens_per_minute),
+            self.token_tokens + elapsed * self.max_tokens_per_minute / 60
+        )
+        self.last_update = now
+
+    def would_allow(self, estimated_tokens: int = 500) -> bool:
+        """Check whether a request would be allowed, without recording anything.
+
+        Pure read: projects the bucket refill from the elapsed time but
+        mutates no state, so it is safe to call speculatively. Callers
+        serving from a cache layer should check the cache first and only
+        go through check_rate_limit/record_request on a cache miss —
+        cache hits must never consume rate-limit budget.
+
+        Args:
+            estimated_tokens: Expected model-token consumption of the request
+
+        Returns:
+            True if the request would currently be allowed
+        """
+        elapsed = time.monotonic() - self.last_update
+        projected_requests = min(
+            float(self.max_requests_per_minute),
+            self.request_tokens + elapsed * self.max_requests_per_minute / 60
+        )
+        projected_tokens = min(
+            float(self.max_tokens_per_minute),
+            self.token_tokens + elapsed * self.max_tokens_per_minute / 60
+        )
+        if projected_requests < 1 or projected_tokens < estimated_tokens:
+            return False
+
+        today = self._today_key()
+        return (self.daily_requests.get(today, 0) < self.max_requests_per_day
+                and self.daily_costs.get(today, 0.0) < self.max_daily_cost)
+
+    def check_rate_limit(self, estimated_tokens: int = 500) -> tuple[bool, Optional[str]]:
         """Check if request is allowed.
-        
+
+        Args:
+            estimated_tokens: Expected model-token consumption of the request
+
         Returns:
             Tuple of (allowed, error_message)
         """
-        self._reset_if_new_day()
-        self._clean_old_timestamps()
-        
+        today = self._today_key()
+        self._refill()
+
         # Check per-minute limit
-        if len(self.requests_timestamps) >= self.max_requests_per_minute:
+        if self.request_tokens < 1:
             return False, f"Rate limit exceeded: {self.max_requests_per_minute} requests per minute"
+
+        # Check tokens-per-minute limit
+        if self.token_tokens < estimated_tokens:
+            return False, f"Rate limit exceeded: {self.max_tokens_per_minute} tokens per minute"
         
         # Check per-day limit
-        today = datetime.now().date().isoformat()
-        if self.daily_requests[today] >= self.max_requests_per_day:
+        if self.daily_requests.get(today, 0) >= self.max_requests_per_day:
             return False, f"Daily limit exceeded: {self.max_requests_per_day} requests per day"
-        
+
         # Check daily cost limit
-        if self.daily_costs[today] >= self.max_daily_cost:
+        if self.daily_costs.get(today, 0.0) >= self.max_daily_cost:
             return False, f"Daily cost limit exceeded: ${self.max_daily_cost:.2f} USD per day"
         
         return True, None
@@ -110,13 +261,15 @@ class RateLimiter:
         Args:
             estimated_tokens: Estimated number of tokens used
         """
-        self._reset_if_new_day()
-        
-        # Record timestamp
-        self.requests_timestamps.append(time.time())
-        
+        today = self._today_key()
+
+        # Consume from both buckets atomically
+        self._refill()
+        self.request_tokens = max(0.0, self.request_tokens - 1)
+        self.token_tokens = max(0.0, self.token_tokens - estimated_tokens)
+        self.minute_bucket.incr()
+
         # Record daily request
-        today = datetime.now().date().isoformat()
         self.daily_requests[today] += 1
         
         # Estimate and record cost (tokens to cost conversion)
@@ -127,22 +280,32 @@ class RateLimiter:
         input_cost = (input_tokens / 1_000_000) * 0.15
         output_cost = (output_tokens / 1_000_000) * 0.60
         estimated_cost = input_cost + output_cost
-        self.daily_costs[today] += estimated_cost
-        
-        # Save state
-        self._save_state()
+        self.daily_costs[today] = self.daily_costs.get(today, 0.0) + estimated_cost
+
+        # Mark dirty; actual disk write happens at most every few seconds
+        self._dirty = True
+        self._flush_if_due()
     
-    def wait_if_needed(self):
-        """Wait if rate limit would be exceeded."""
-        self._clean_old_timestamps()
-        
-        if len(self.requests_timestamps) >= self.max_requests_per_minute:
-            # Wait until oldest request is 1 minute old
-            if self.requests_timestamps:
-                oldest = min(self.requests_timestamps)
-                wait_time = 60 - (time.time() - oldest) + 1
-                if wait_time > 0:
-                    time.sleep(wait_time)
+    def wait_if_needed(self, estimated_tokens: int = 500):
+        """Wait if rate limit would be exceeded.
+
+        Args:
+            estimated_tokens: Expected model-token consumption of the request
+        """
+        self._refill()
+
+        wait_time = 0.0
+        if self.request_tokens < 1:
+            # Wait exactly long enough for one request token to accrue
+            wait_time = (1 - self.request_tokens) * 60 / self.max_requests_per_minute
+        if self.token_tokens < estimated_tokens:
+            wait_time = max(
+                wait_time,
+                (estimated_tokens - self.token_tokens) * 60 / self.max_tokens_per_minute
+            )
+        if wait_time > 0:
+            time.sleep(wait_time)
+            self._refill()
     
     def get_stats(self) -> Dict:
         """Get current rate limit statistics.
@@ -150,11 +313,11 @@ class RateLimiter:
         Returns:
             Dictionary with stats
         """
-        self._reset_if_new_day()
-        today = datetime.now().date().isoformat()
-        
+        today = self._today_key()
+        self._refill()
+
         return {
-            'requests_last_minute': len(self.requests_timestamps),
+            'requests_last_minute': self.minute_bucket.count(),
             'max_requests_per_minute': self.max_requests_per_minute,
             'requests_today': self.daily_requests.get(today, 0),
             'max_requests_per_day': self.max_requests_per_day,
@@ -169,8 +332,11 @@ class CostTracker:
     
     def __init__(self):
         """Initialize cost tracker."""
-        self.daily_costs = defaultdict(float)
+        self.daily_costs = {}
         self.last_reset_date = datetime.now().date()
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        atexit.register(self._save_costs)
         self._load_costs()
     
     def _load_costs(self):
@@ -178,8 +344,8 @@ class CostTracker:
         cost_file = 'cost_tracker.json'
         if os.path.exists(cost_file):
             try:
-                with open(cost_file, 'r') as f:
-                    data = json.load(f)
+                with open(cost_file, 'rb') as f:
+                    data = orjson.loads(f.read())
                     self.daily_costs = {k: float(v) for k, v in data.items()}
             except Exception as e:
                 print(f"Error loading cost data: {e}")
@@ -191,9 +357,13 @@ class CostTracker:
             # Keep only last 30 days
             cutoff_date = (datetime.now().date() - timedelta(days=30)).isoformat()
             filtered_costs = {k: v for k, v in self.daily_costs.items() if k >= cutoff_date}
-            
-            with open(cost_file, 'w') as f:
-                json.dump(filtered_costs, f, indent=2)
+
+            tmp_file = cost_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(filtered_costs, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_file, cost_file)
+            self._dirty = False
+            self._last_flush = time.monotonic()
         except Exception as e:
             print(f"Error saving cost data: {e}")
     
@@ -204,8 +374,10 @@ class CostTracker:
             amount: Cost in USD
         """
         today = datetime.now().date().isoformat()
-        self.daily_costs[today] += amount
-        self._save_costs()
+        self.daily_costs[today] = self.daily_costs.get(today, 0.0) + amount
+        self._dirty = True
+        if time.monotonic() - self._last_flush > _FLUSH_INTERVAL:
+            self._save_costs()
     
     def get_daily_cost(self, date: Optional[datetime] = None) -> float:
         """Get cost for a specific date.
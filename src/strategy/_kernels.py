@@ -0,0 +1,158 @@
+"""Compiled scalar kernels for the trading strategy hot path.
+
+All kernels compile with cache=True, so the machine code persists on
+disk and worker processes skip the JIT warmup. The entry point sets
+NUMBA_CACHE_DIR to a shared .numba_cache directory so every process
+(including ProcessPoolExecutor backtest workers) hits the same cache.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional: without it the kernels run as plain Python,
+    # same results, just slower
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
+
+_NAN = float('nan')
+
+# Order of the positional arguments produced by _pack_indicators
+INDICATOR_ORDER = ('RSI', 'MACD', 'MACD_signal', 'MACD_diff', 'MA_20',
+                   'MA_50', 'MA_200', 'current_price', 'BB_high', 'BB_low',
+                   'BB_mid', 'volume', 'volume_sma')
+
+# Packed indicator row: field names match the dict keys, so the strategy
+# helpers read fixed tuple offsets instead of re-hashing the same keys
+Indicators = namedtuple('Indicators', INDICATOR_ORDER)
+
+
+def _pack_indicators(indicators: dict) -> Indicators:
+    """Convert an indicators dict into positional floats for the kernel.
+
+    One pass over the dict; None or absent values become NaN, the
+    kernel's missing-value convention. The result unpacks straight into
+    tech_score and gives the pure-Python helpers named field access.
+
+    Args:
+        indicators: Indicator name -> value (or None) mapping
+
+    Returns:
+        Indicators tuple of 13 floats in INDICATOR_ORDER
+    """
+    get = indicators.get
+    return Indicators._make(
+        _NAN if (v := get(key)) is None else float(v)
+        for key in INDICATOR_ORDER
+    )
+
+
+# Relaxed float math (FMA contraction, reassociation) but NOT the full
+# fastmath set: nnan/ninf would let LLVM fold away the isnan checks the
+# missing-value convention depends on
+_FASTMATH_FLAGS = {'contract', 'reassoc', 'nsz', 'arcp'}
+
+
+def _tech_eval_py(rsi: float, macd: float, macd_sig: float, macd_diff: float,
+                  ma20: float, ma50: float, ma200: float, price: float,
+                  bb_hi: float, bb_lo: float, bb_mid: float,
+                  volume: float, volume_sma: float):
+    """Technical score and confidence for one bar in a single pass.
+
+    Pure-float rewrite of the dict-walking scoring cascade: NaN means a
+    missing indicator, and two running accumulators replace the old
+    scores list. Compiled with numba when available (cache=True so only
+    the first process pays the JIT cost).
+
+    The per-indicator rules are branchless: each contribution is a sum
+    of boolean-times-constant products instead of an if/elif ladder, so
+    the compiled code avoids data-dependent branch mispredictions. Each
+    product pairs a constant with a mutually-exclusive condition, which
+    keeps every output bit-identical to the original step functions.
+
+    Missing is exactly NaN: a legitimate zero value (e.g. a flat MACD
+    histogram) counts as present, unlike the old dict path whose
+    truthiness checks silently skipped zeros in the MA/BB/volume rules.
+
+    Confidence counting is fused into the same pass: the six headline
+    presence checks reuse the NaN tests the scoring rules already make,
+    so one call replaces the old score/confidence double walk.
+
+    Args:
+        rsi..volume_sma: Indicator values in INDICATOR_ORDER, NaN when
+            missing
+
+    Returns:
+        Tuple of (technical score from -1 to 1, confidence from 0 to 1)
+    """
+    total = 0.0
+    n = 0
+
+    # RSI bands
+    if not np.isnan(rsi):
+        total += (0.7 * (rsi < 30.0) - 0.7 * (rsi > 70.0)
+                  + 0.2 * ((rsi >= 30.0) & (rsi < 50.0))
+                  - 0.2 * ((rsi >= 50.0) & (rsi <= 70.0)))
+        n += 1
+
+    # MACD crossover
+    if not np.isnan(macd) and not np.isnan(macd_sig):
+        total += 0.5 * (macd > macd_sig) - 0.3 * (macd <= macd_sig)
+        n += 1
+
+    # MACD histogram direction
+    if not np.isnan(macd_diff):
+        total += 0.3 * (macd_diff > 0.0) - 0.3 * (macd_diff <= 0.0)
+        n += 1
+
+    # Moving-average alignment
+    if (not np.isnan(ma20) and not np.isnan(ma50)
+            and not np.isnan(price)):
+        total += (0.6 * ((price > ma20) & (ma20 > ma50))
+                  - 0.6 * ((price < ma20) & (ma20 < ma50)))
+        n += 1
+
+    # Long-term trend
+    if not np.isnan(ma200) and not np.isnan(price):
+        total += 0.2 * (price > ma200) - 0.2 * (price <= ma200)
+        n += 1
+
+    # Bollinger Bands (low-band test wins when both hold)
+    if (not np.isnan(bb_hi) and not np.isnan(bb_lo)
+            and not np.isnan(bb_mid) and not np.isnan(price)):
+        total += (0.5 * (price <= bb_lo)
+                  - 0.5 * ((price >= bb_hi) & (price > bb_lo)))
+        n += 1
+
+    # Volume only contributes (and counts) when extreme
+    if not np.isnan(volume) and not np.isnan(volume_sma):
+        vol_hi = volume > volume_sma * 1.5
+        vol_lo = (volume < volume_sma * 0.5) & (volume <= volume_sma * 1.5)
+        total += 0.2 * vol_hi - 0.1 * vol_lo
+        n += vol_hi | vol_lo
+
+    # Availability count for confidence, reusing the NaN tests above
+    available = (int(not np.isnan(rsi)) + int(not np.isnan(macd))
+                 + int(not np.isnan(ma20)) + int(not np.isnan(ma50))
+                 + int(not np.isnan(ma200)) + int(not np.isnan(bb_hi)))
+    confidence = min(1.0, 0.4 + available / 10.0)
+
+    if n == 0:
+        return 0.0, confidence
+    return max(-1.0, min(1.0, total / n)), confidence
+
+
+# Prefer the ahead-of-time build (see build_kernels.py) when present:
+# same code, no first-call JIT warmup. Otherwise JIT-compile on demand.
+try:
+    from .strategy_kernels import tech_eval
+except ImportError:
+    tech_eval = njit(cache=True, fastmath=_FASTMATH_FLAGS,
+                     error_model='numpy')(_tech_eval_py)
@@ -2,7 +2,9 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Optional
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from .trading_strategy import SentimentTradingStrategy
 import sys
@@ -14,10 +16,23 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from market_data.yahoo_finance import MarketDataFetcher
 from database.db_manager import DatabaseManager
 
+# Executed trade record: a namedtuple is several times smaller than the
+# per-trade dict it replaces and reads by attribute in the win-rate loop;
+# amount is the cash moved (cost for buys, revenue for sells). Dicts are
+# built once at the end for the JSON payload.
+Trade = namedtuple('Trade', ['date', 'type', 'shares', 'price', 'amount'])
+
 
 class BacktestingEngine:
     """Backtesting engine for trading strategies."""
-    
+
+    # Indicator columns copied from the precomputed frame into the per-bar
+    # indicators dict handed to the strategy
+    _INDICATOR_FIELDS = ('RSI', 'MACD', 'MACD_signal', 'MACD_diff',
+                         'MA_20', 'MA_50', 'MA_200',
+                         'BB_high', 'BB_low', 'BB_mid')
+
+
     def __init__(self, initial_capital: float = 100000, transaction_cost: float = 0.001):
         """Initialize backtesting engine.
         
@@ -32,9 +47,10 @@ class BacktestingEngine:
     def run_backtest(self, strategy: SentimentTradingStrategy, ticker: str,
                     start_date: datetime, end_date: datetime,
                     sentiment_data_fn: Optional[callable] = None,
-                    db_manager: Optional[DatabaseManager] = None) -> Dict:
+                    db_manager: Optional[DatabaseManager] = None,
+                    sp500_df: Optional[pd.DataFrame] = None) -> Dict:
         """Run backtest on historical data.
-        
+
         Args:
             strategy: Trading strategy instance
             ticker: Stock ticker symbol
@@ -42,7 +58,9 @@ class BacktestingEngine:
             end_date: End date for backtest
             sentiment_data_fn: Optional function to get historical sentiment data
             db_manager: Optional database manager for sentiment data
-            
+            sp500_df: Optional pre-fetched S&P 500 benchmark frame (batch
+                runs fetch it once and pass it in)
+
         Returns:
             Dictionary with backtest results and performance metrics
         """
@@ -56,18 +74,27 @@ class BacktestingEngine:
                 'ticker': ticker
             }
         
-        # Filter by date range
-        market_df['date'] = pd.to_datetime(market_df['date'])
-        market_df = market_df[(market_df['date'] >= start_date) & 
-                             (market_df['date'] <= end_date)].copy()
-        
+        # Filter by date range. The fetcher already returns a
+        # datetime-typed column; only convert when something else (e.g. a
+        # database read of strings) got here, since pd.to_datetime walks
+        # the full column even when it is a no-op.
+        if not pd.api.types.is_datetime64_any_dtype(market_df['date']):
+            market_df['date'] = pd.to_datetime(market_df['date'])
+        mask = (market_df['date'] >= start_date) & (market_df['date'] <= end_date)
+        market_df = market_df.loc[mask]
+
         if market_df.empty:
             return {
                 'error': 'No market data in the specified date range',
                 'ticker': ticker
             }
-        
-        market_df = market_df.sort_values('date').reset_index(drop=True)
+
+        # Yahoo data arrives date-sorted; only pay for a sort when it is
+        # not. reset_index materializes the filtered frame either way, so
+        # no separate .copy() is needed before the column writes below.
+        if not market_df['date'].is_monotonic_increasing:
+            market_df = market_df.sort_values('date')
+        market_df = market_df.reset_index(drop=True)
         
         # Load historical sentiment data
         if db_manager:
@@ -76,7 +103,25 @@ class BacktestingEngine:
             sentiment_df = sentiment_data_fn(ticker, start_date, end_date)
         else:
             sentiment_df = pd.DataFrame()
-        
+
+        # Join the most recent sentiment at or before each bar via one
+        # sorted merge, instead of re-filtering sentiment_df on every bar
+        # of the loop (O(N*M) scans)
+        if not sentiment_df.empty:
+            sentiment_cols = sentiment_df[
+                ['date', 'avg_sentiment_score', 'avg_confidence', 'mention_count']
+            ].sort_values('date')
+            market_df = pd.merge_asof(market_df, sentiment_cols,
+                                      on='date', direction='backward')
+        else:
+            market_df['avg_sentiment_score'] = np.nan
+            market_df['avg_confidence'] = np.nan
+            market_df['mention_count'] = np.nan
+        # NaN = no sentiment recorded yet by that bar
+        market_df['avg_sentiment_score'] = market_df['avg_sentiment_score'].fillna(0.0)
+        market_df['avg_confidence'] = market_df['avg_confidence'].fillna(0.3)
+        market_df['mention_count'] = market_df['mention_count'].fillna(0)
+
         # Initialize portfolio
         portfolio = {
             'cash': self.initial_capital,
@@ -84,49 +129,69 @@ class BacktestingEngine:
             'positions': []
         }
         
-        daily_values = []
-        daily_returns = []
         trades = []
-        
+
+        # Pre-compute every indicator over the full frame once. The old
+        # per-bar path re-filtered the frame (market_df[market_df['date'] <=
+        # current_date].copy()) and recomputed each indicator from scratch,
+        # O(N^2) in trading days; rolling/ewm kernels are causal, so the
+        # value at bar i is identical either way.
+        self._calculate_indicators_bulk(market_df)
+
+        # Extract columns to plain arrays once (SoA layout): positional
+        # ndarray reads per bar instead of pandas row objects, which pay
+        # label lookup and boxing on every attribute access
+        n_bars = len(market_df)
+        dates = market_df['date'].to_list()
+        closes = market_df['Close'].to_numpy(dtype=np.float64)
+        volumes = market_df['Volume'].to_numpy()
+        sent_scores = market_df['avg_sentiment_score'].to_numpy(dtype=np.float64)
+        sent_confs = market_df['avg_confidence'].to_numpy(dtype=np.float64)
+        sent_counts = market_df['mention_count'].to_numpy()
+        indicator_arrays = [(name, market_df[name].to_numpy(dtype=np.float64))
+                            for name in self._INDICATOR_FIELDS]
+        volume_smas = market_df['Volume_SMA'].to_numpy(dtype=np.float64)
+        # Validity checked once for the whole column rather than per bar
+        volumes_valid = pd.notna(volumes)
+
+        # Preallocated per-bar portfolio values, filled by position
+        values = np.empty(n_bars)
+
         # Run backtest day by day
-        for idx, row in market_df.iterrows():
-            current_date = row['date']
-            current_price = row['Close']
-            
-            # Get sentiment for this date (use most recent available)
-            if not sentiment_df.empty:
-                sentiment_up_to_date = sentiment_df[sentiment_df['date'] <= current_date]
-                if not sentiment_up_to_date.empty:
-                    latest_sentiment = sentiment_up_to_date.iloc[-1]
-                    sentiment_data = {
-                        'weighted_score': latest_sentiment.get('avg_sentiment_score', 0.0),
-                        'confidence': latest_sentiment.get('avg_confidence', 0.5),
-                        'total_count': latest_sentiment.get('mention_count', 0),
-                        'overall_sentiment': 'neutral'
-                    }
-                else:
-                    sentiment_data = {'weighted_score': 0.0, 'confidence': 0.3, 
-                                    'total_count': 0, 'overall_sentiment': 'neutral'}
-            else:
-                sentiment_data = {'weighted_score': 0.0, 'confidence': 0.3,
-                                'total_count': 0, 'overall_sentiment': 'neutral'}
-            
-            # Get technical indicators for this date
-            # Calculate indicators from historical data up to this point
-            market_data_up_to_date = market_df[market_df['date'] <= current_date].copy()
-            
-            if len(market_data_up_to_date) >= 20:  # Need enough data for indicators
-                indicators = self._calculate_indicators_for_date(market_data_up_to_date, current_price)
+        for i in range(n_bars):
+            current_date = dates[i]
+            current_price = closes[i]
+
+            # Most recent sentiment at or before this bar (pre-joined above)
+            sentiment_data = {
+                'weighted_score': float(sent_scores[i]),
+                'confidence': float(sent_confs[i]),
+                'total_count': int(sent_counts[i]),
+                'overall_sentiment': 'neutral'
+            }
+
+            # Read this bar's precomputed indicators off the arrays
+            if i >= 19:  # Need enough data for indicators
+                indicators = {
+                    name: float(v) if not np.isnan(v := arr[i]) else None
+                    for name, arr in indicator_arrays
+                }
+                indicators['current_price'] = float(current_price)
+                indicators['volume'] = int(volumes[i]) if volumes_valid[i] else None
+                indicators['volume_sma'] = float(volume_smas[i]) if not np.isnan(volume_smas[i]) else None
             else:
                 indicators = {}
-            
+
             market_data = {
                 'indicators': indicators,
                 'current_price': current_price
             }
             
-            # Generate signal
-            signal = strategy.generate_signal(ticker, sentiment_data, market_data)
+            # Generate signal (the loop never reads the reasoning text,
+            # so skip building it)
+            signal = strategy.generate_signal(ticker, sentiment_data,
+                                              market_data,
+                                              include_reasoning=False)
             
             # Execute trades based on signal
             if signal['signal_type'] == 'buy' and portfolio['cash'] > 0:
@@ -144,13 +209,8 @@ class BacktestingEngine:
                         portfolio['cash'] -= cost
                         portfolio['shares'] += shares_to_buy
                         
-                        trades.append({
-                            'date': current_date,
-                            'type': 'buy',
-                            'shares': shares_to_buy,
-                            'price': current_price,
-                            'cost': cost
-                        })
+                        trades.append(Trade(current_date, 'buy',
+                                            shares_to_buy, current_price, cost))
             
             elif signal['signal_type'] == 'sell' and portfolio['shares'] > 0:
                 # Sell all shares
@@ -160,85 +220,71 @@ class BacktestingEngine:
                 portfolio['cash'] += revenue
                 portfolio['shares'] = 0
                 
-                trades.append({
-                    'date': current_date,
-                    'type': 'sell',
-                    'shares': shares_to_sell,
-                    'price': current_price,
-                    'revenue': revenue
-                })
+                trades.append(Trade(current_date, 'sell',
+                                    shares_to_sell, current_price, revenue))
             
             # Calculate portfolio value
-            portfolio_value = portfolio['cash'] + (portfolio['shares'] * current_price)
-            daily_values.append({
-                'date': current_date,
-                'value': portfolio_value,
-                'cash': portfolio['cash'],
-                'shares': portfolio['shares'],
-                'price': current_price
-            })
-        
-        # Calculate daily returns
-        df_values = pd.DataFrame(daily_values)
-        if len(df_values) > 1:
-            df_values['daily_return'] = df_values['value'].pct_change()
-            daily_returns = df_values['daily_return'].dropna().tolist()
-        else:
-            daily_returns = [0.0]
-        
-        # Calculate final value
-        final_row = df_values.iloc[-1]
-        final_value = final_row['value']
-        final_price = final_row['price']
-        
+            values[i] = portfolio['cash'] + portfolio['shares'] * current_price
+
+        # Daily returns straight off the value array — no intermediate
+        # DataFrame, and no tolist() round-trip through Python floats
+        # before the stats
+        rets = np.diff(values) / values[:-1] if n_bars > 1 else np.empty(0)
+
+        final_value = values[-1]
+
         # Calculate performance metrics
         total_return = ((final_value - self.initial_capital) / self.initial_capital) * 100
-        
+
         # Sharpe ratio (assuming 252 trading days per year)
-        if len(daily_returns) > 1 and np.std(daily_returns) > 0:
-            sharpe_ratio = (np.mean(daily_returns) / np.std(daily_returns)) * np.sqrt(252)
+        if rets.size > 1 and np.std(rets) > 0:
+            sharpe_ratio = (np.mean(rets) / np.std(rets)) * np.sqrt(252)
         else:
             sharpe_ratio = 0.0
-        
+
         # Maximum drawdown
-        if len(df_values) > 0:
-            cumulative = (1 + df_values['daily_return']).cumprod()
-            running_max = cumulative.cummax()
-            drawdown = (cumulative - running_max) / running_max
-            max_drawdown = float(drawdown.min()) * 100
+        if rets.size > 0:
+            cumulative = np.cumprod(1 + rets)
+            running_max = np.maximum.accumulate(cumulative)
+            max_drawdown = float(((cumulative - running_max) / running_max).min()) * 100
         else:
             max_drawdown = 0.0
+
+        # Serialized only here, for the JSON payload
+        daily_returns = rets.tolist() if rets.size else [0.0]
         
         # Win rate (for trades)
         if len(trades) >= 2:
-            # Simple win rate calculation based on profitable exits
+            # Simple win rate calculation based on profitable exits; only
+            # the most recent buy price is ever compared, so a single
+            # scalar replaces the old dict of every buy
             profitable_trades = 0
             total_sell_trades = 0
-            buy_prices = {}
-            
+            last_buy_price = None
+
             for trade in trades:
-                if trade['type'] == 'buy':
-                    buy_prices[trade['date']] = trade['price']
-                elif trade['type'] == 'sell':
+                if trade.type == 'buy':
+                    last_buy_price = trade.price
+                elif trade.type == 'sell':
                     total_sell_trades += 1
-                    # Find corresponding buy price (simplified - uses most recent buy)
-                    if buy_prices:
-                        last_buy_price = list(buy_prices.values())[-1]
-                        if trade['price'] > last_buy_price:
-                            profitable_trades += 1
-            
+                    if last_buy_price is not None and trade.price > last_buy_price:
+                        profitable_trades += 1
+
             win_rate = (profitable_trades / total_sell_trades * 100) if total_sell_trades > 0 else 0.0
         else:
             win_rate = 0.0
         
         # Compare with S&P 500
-        sp500_df = self.market_fetcher.get_sp500_data(period=period)
+        if sp500_df is None:
+            sp500_df = self.market_fetcher.get_sp500_data(period=period)
         sp500_performance = 0.0
         
         if not sp500_df.empty:
-            sp500_df['date'] = pd.to_datetime(sp500_df['date'])
-            sp500_df = sp500_df[(sp500_df['date'] >= start_date) & 
-                               (sp500_df['date'] <= end_date)].copy()
+            if not pd.api.types.is_datetime64_any_dtype(sp500_df['date']):
+                sp500_df['date'] = pd.to_datetime(sp500_df['date'])
+            # Read-only below, so the filtered view needs no copy
+            sp500_df = sp500_df.loc[(sp500_df['date'] >= start_date) &
+                                    (sp500_df['date'] <= end_date)]
             
             if not sp500_df.empty and len(sp500_df) > 1:
                 sp500_start = sp500_df.iloc[0]['Close']
@@ -261,14 +307,58 @@ class BacktestingEngine:
             'vs_sp500_performance': float(vs_sp500),
             'sp500_return': float(sp500_performance),
             'daily_returns': daily_returns,
-            'daily_values': [{'date': v['date'].isoformat(), 'value': v['value']} 
-                           for v in daily_values],
-            'trades': [{'date': t['date'].isoformat(), 'type': t['type'], 
-                       'shares': t['shares'], 'price': t['price']} 
-                      for t in trades],
+            'daily_values': [{'date': d.isoformat(), 'value': float(v)}
+                             for d, v in zip(dates, values)],
+            'trades': [{'date': t.date.isoformat(), 'type': t.type,
+                        'shares': t.shares, 'price': t.price}
+                       for t in trades],
             'total_trades': len(trades)
         }
     
+    def run_backtest_batch(self, strategy: SentimentTradingStrategy,
+                           tickers: List[str], start_date: datetime,
+                           end_date: datetime,
+                           max_workers: Optional[int] = None) -> Dict[str, Dict]:
+        """Run independent backtests for many tickers in parallel.
+
+        After the indicator rewrites each backtest is CPU-bound and
+        shares no mutable state, so a universe of tickers fans out
+        across worker processes instead of running serially. The S&P 500
+        benchmark is fetched once in the parent and shipped to every
+        worker rather than refetched per ticker. Sentiment sources
+        (db_manager / sentiment_data_fn) do not pickle across processes,
+        so batch runs use market data only.
+
+        Args:
+            strategy: Trading strategy instance
+            tickers: List of ticker symbols
+            start_date: Start date for backtest
+            end_date: End date for backtest
+            max_workers: Worker process count (default: one per CPU)
+
+        Returns:
+            Dictionary mapping ticker to its backtest result
+        """
+        period = self._calculate_period(start_date, end_date)
+        sp500_df = self.market_fetcher.get_sp500_data(period=period)
+
+        results = {}
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+            futures = {
+                pool.submit(_run_backtest_worker, self.initial_capital,
+                            self.transaction_cost, strategy, ticker,
+                            start_date, end_date, sp500_df): ticker
+                for ticker in tickers
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    results[ticker] = future.result()
+                except Exception as e:
+                    print(f"Error backtesting {ticker}: {e}")
+                    results[ticker] = {'error': str(e), 'ticker': ticker}
+        return results
+
     def _calculate_period(self, start_date: datetime, end_date: datetime) -> str:
         """Calculate period string for yfinance based on date range.
         
@@ -296,75 +386,30 @@ class BacktestingEngine:
         else:
             return 'max'
     
-    def _calculate_indicators_for_date(self, market_df: pd.DataFrame, current_price: float) -> Dict:
-        """Calculate technical indicators up to a specific date.
-        
+    @staticmethod
+    def _calculate_indicators_bulk(market_df: pd.DataFrame) -> None:
+        """Compute indicator columns over the full frame in place.
+
+        Delegates to MarketDataFetcher's vectorized kernels so backtests
+        use exactly the same indicator math as live fetching.
+
         Args:
-            market_df: Historical market data up to the date
-            current_price: Current price
-            
-        Returns:
-            Dictionary with technical indicators
+            market_df: DataFrame with Close and Volume columns
         """
-        try:
-            import ta
-            
-            df = market_df.copy()
-            
-            # Calculate RSI
-            if len(df) >= 14:
-                rsi = ta.momentum.RSIIndicator(close=df['Close'], window=14)
-                rsi_value = rsi.rsi().iloc[-1] if pd.notna(rsi.rsi().iloc[-1]) else None
-            else:
-                rsi_value = None
-            
-            # Calculate MACD
-            if len(df) >= 26:
-                macd = ta.trend.MACD(close=df['Close'])
-                macd_value = macd.macd().iloc[-1] if pd.notna(macd.macd().iloc[-1]) else None
-                macd_signal = macd.macd_signal().iloc[-1] if pd.notna(macd.macd_signal().iloc[-1]) else None
-                macd_diff = macd.macd_diff().iloc[-1] if pd.notna(macd.macd_diff().iloc[-1]) else None
-            else:
-                macd_value = None
-                macd_signal = None
-                macd_diff = None
-            
-            # Calculate Moving Averages
-            ma_20 = ta.trend.SMAIndicator(close=df['Close'], window=20).sma_indicator().iloc[-1] if len(df) >= 20 else None
-            ma_50 = ta.trend.SMAIndicator(close=df['Close'], window=50).sma_indicator().iloc[-1] if len(df) >= 50 else None
-            ma_200 = ta.trend.SMAIndicator(close=df['Close'], window=200).sma_indicator().iloc[-1] if len(df) >= 200 else None
-            
-            # Bollinger Bands
-            if len(df) >= 20:
-                bb = ta.volatility.BollingerBands(close=df['Close'], window=20)
-                bb_high = bb.bollinger_hband().iloc[-1] if pd.notna(bb.bollinger_hband().iloc[-1]) else None
-                bb_low = bb.bollinger_lband().iloc[-1] if pd.notna(bb.bollinger_lband().iloc[-1]) else None
-                bb_mid = bb.bollinger_mavg().iloc[-1] if pd.notna(bb.bollinger_mavg().iloc[-1]) else None
-            else:
-                bb_high = None
-                bb_low = None
-                bb_mid = None
-            
-            # Volume
-            volume = df['Volume'].iloc[-1] if len(df) > 0 else None
-            volume_sma = ta.volume.VolumeSMAIndicator(close=df['Close'], volume=df['Volume'], window=20).volume_sma().iloc[-1] if len(df) >= 20 else None
-            
-            return {
-                'RSI': float(rsi_value) if rsi_value is not None else None,
-                'MACD': float(macd_value) if macd_value is not None else None,
-                'MACD_signal': float(macd_signal) if macd_signal is not None else None,
-                'MACD_diff': float(macd_diff) if macd_diff is not None else None,
-                'MA_20': float(ma_20) if ma_20 is not None else None,
-                'MA_50': float(ma_50) if ma_50 is not None else None,
-                'MA_200': float(ma_200) if ma_200 is not None else None,
-                'BB_high': float(bb_high) if bb_high is not None else None,
-                'BB_low': float(bb_low) if bb_low is not None else None,
-                'BB_mid': float(bb_mid) if bb_mid is not None else None,
-                'current_price': float(current_price),
-                'volume': int(volume) if volume is not None else None,
-                'volume_sma': float(volume_sma) if volume_sma is not None else None
-            }
-        except Exception as e:
-            print(f"Error calculating indicators: {e}")
-            return {}
+        MarketDataFetcher._add_indicator_columns(market_df)
+
+
+def _run_backtest_worker(initial_capital: float, transaction_cost: float,
+                         strategy: SentimentTradingStrategy, ticker: str,
+                         start_date: datetime, end_date: datetime,
+                         sp500_df: pd.DataFrame) -> Dict:
+    """Run one ticker's backtest in a worker process.
+
+    Module-level so it pickles; the engine (and its market fetcher) is
+    created inside the worker rather than shipped across the process
+    boundary.
+    """
+    engine = BacktestingEngine(initial_capital, transaction_cost)
+    return engine.run_backtest(strategy, ticker, start_date, end_date,
+                               sp500_df=sp500_df)
 
@@ -0,0 +1,30 @@
+"""Ahead-of-time build for the strategy scoring kernel.
+
+Compiles tech_eval into a strategy_kernels extension module next to
+_kernels.py so short runs skip the ~1s first-call JIT warmup:
+
+    python -m strategy.build_kernels
+
+The build is optional: when the compiled module is absent the package
+falls back to the JIT (or pure-Python) version of the same function.
+"""
+
+import os
+
+from numba.pycc import CC
+
+from ._kernels import _tech_eval_py
+
+_SIG = 'UniTuple(f8, 2)(f8,f8,f8,f8,f8,f8,f8,f8,f8,f8,f8,f8,f8)'
+
+cc = CC('strategy_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+cc.export('tech_eval', _SIG)(_tech_eval_py)
+
+
+if __name__ == '__main__':
+    try:
+        cc.compile()
+        print(f"Built strategy_kernels in {cc.output_dir}")
+    except Exception as e:
+        print(f"Error building strategy kernels: {e}")
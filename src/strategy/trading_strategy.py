@@ -1,8 +1,97 @@
 """Trading strategy module combining sentiment and technical indicators."""
 
+from enum import IntEnum
 from typing import Dict, Optional, List
 import numpy as np
 
+from ._kernels import Indicators, tech_eval, _pack_indicators
+
+try:
+    import cupy as _cupy
+except ImportError:
+    _cupy = None
+
+
+def _build_reason_table() -> tuple:
+    """Pre-join every possible technical-reasons sentence at import.
+
+    The three reasoning conditions (RSI band, MACD direction, price vs
+    MA20) each have three states, so all 27 sentences can be built once
+    and looked up by a single computed index instead of conditional
+    string appends and a join per signal.
+
+    Returns:
+        Tuple of 27 sentences indexed by
+        rsi_state + 3*macd_state + 9*ma_state ('' = no fragments)
+    """
+    rsi_frags = (None, "RSI indicates oversold conditions",
+                 "RSI indicates overbought conditions")
+    macd_frags = (None, "MACD shows bullish momentum",
+                  "MACD shows bearish momentum")
+    ma_frags = (None, "Price is above 20-day moving average",
+                "Price is below 20-day moving average")
+    table = []
+    for ma_state in range(3):
+        for macd_state in range(3):
+            for rsi_state in range(3):
+                frags = [f for f in (rsi_frags[rsi_state],
+                                     macd_frags[macd_state],
+                                     ma_frags[ma_state]) if f]
+                table.append("Technical indicators: " + ", ".join(frags)
+                             if frags else "")
+    return tuple(table)
+
+
+_REASON_TABLE = _build_reason_table()
+
+
+class Signal(IntEnum):
+    """Compact signal verdict; the int values fit an int8 column.
+
+    The scalar API keeps its 'buy'/'sell'/'hold' strings for the
+    database and HTTP payloads; Signal(value).name.lower() recovers the
+    label from a coded array.
+    """
+    SELL = -1
+    HOLD = 0
+    BUY = 1
+
+
+def _make_eval(sentiment_weight: float, technical_weight: float,
+               buy_threshold: float, sell_threshold: float):
+    """Build the score-combining step with the weights baked in.
+
+    Binding the four strategy constants as closure locals removes the
+    self.* attribute loads from the per-bar hot path; the returned
+    function is pure arithmetic on its arguments.
+
+    Args:
+        sentiment_weight: Normalized sentiment weight
+        technical_weight: Normalized technical weight
+        buy_threshold: Score above which the signal is a buy
+        sell_threshold: Score below which the signal is a sell
+
+    Returns:
+        Function (sent_score, tech_score, sent_conf, tech_conf) ->
+        (final_score, overall_confidence, signal_type)
+    """
+    def _eval(sentiment_score: float, technical_score: float,
+              sentiment_confidence: float, technical_confidence: float):
+        final_score = (sentiment_weight * sentiment_score
+                       + technical_weight * technical_score)
+        overall_confidence = (sentiment_weight * sentiment_confidence
+                              + technical_weight * technical_confidence)
+        # Test the dominant hold outcome first: most bars sit between
+        # the thresholds, so the common case takes one predictable branch
+        if sell_threshold <= final_score <= buy_threshold:
+            signal_type = 'hold'
+        elif final_score > buy_threshold:
+            signal_type = 'buy'
+        else:
+            signal_type = 'sell'
+        return final_score, overall_confidence, signal_type
+    return _eval
+
 
 class SentimentTradingStrategy:
     """Trading strategy that combines sentiment analysis with technical indicators."""
@@ -27,16 +116,40 @@ class SentimentTradingStrategy:
         if total_weight > 0:
             self.sentiment_weight = sentiment_weight / total_weight
             self.technical_weight = technical_weight / total_weight
-    
-    def generate_signal(self, ticker: str, sentiment_data: Dict, 
-                       market_data: Dict) -> Dict:
+
+        # Score-combining step with the normalized weights and
+        # thresholds bound as closure constants
+        self._eval = _make_eval(self.sentiment_weight, self.technical_weight,
+                                self.buy_threshold, self.sell_threshold)
+
+    def __getstate__(self) -> Dict:
+        """Drop the evaluator closure so the strategy pickles.
+
+        Closures cannot be pickled, and run_backtest_batch ships the
+        strategy to ProcessPoolExecutor workers; the closure is rebuilt
+        from the stored weights on unpickle.
+        """
+        state = self.__dict__.copy()
+        del state['_eval']
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._eval = _make_eval(self.sentiment_weight, self.technical_weight,
+                                self.buy_threshold, self.sell_threshold)
+
+    def generate_signal(self, ticker: str, sentiment_data: Dict,
+                       market_data: Dict, include_reasoning: bool = True) -> Dict:
         """Generate trading signal based on sentiment and market data.
-        
+
         Args:
             ticker: Stock ticker symbol
             sentiment_data: Dictionary with aggregated sentiment metrics
             market_data: Dictionary with technical indicators
-            
+            include_reasoning: Build the human-readable reasoning string;
+                tight loops that never read it can pass False to skip
+                the float formatting
+
         Returns:
             Dictionary with trading signal (buy/sell/hold), confidence, and reasoning
         """
@@ -44,188 +157,301 @@ class SentimentTradingStrategy:
         sentiment_score = sentiment_data.get('weighted_score', 0.0)
         sentiment_confidence = sentiment_data.get('confidence', 0.5)
         
-        # Calculate technical score from indicators
-        technical_score = self._calculate_technical_score(market_data)
-        technical_confidence = self._calculate_technical_confidence(market_data)
-        
-        # Combine scores with weights
-        final_score = (self.sentiment_weight * sentiment_score + 
-                      self.technical_weight * technical_score)
-        
-        # Calculate overall confidence
-        overall_confidence = (self.sentiment_weight * sentiment_confidence + 
-                            self.technical_weight * technical_confidence)
-        
-        # Determine signal type
-        if final_score > self.buy_threshold:
-            signal_type = 'buy'
-        elif final_score < self.sell_threshold:
-            signal_type = 'sell'
-        else:
-            signal_type = 'hold'
+        # Pack the indicators dict into a positional row once; every
+        # downstream helper reads tuple offsets instead of re-hashing
+        # the same dict keys
+        indicators = market_data.get('indicators', {})
+        ind = _pack_indicators(indicators) if indicators else None
+
+        technical_score, technical_confidence = self._score_and_confidence(ind)
         
-        # Generate reasoning
-        reasoning = self._generate_reasoning(
-            signal_type, sentiment_score, technical_score, 
-            sentiment_data, market_data
+        # Combine scores, confidence and thresholds in one call with the
+        # weights pre-bound at __init__
+        final_score, overall_confidence, signal_type = self._eval(
+            sentiment_score, technical_score,
+            sentiment_confidence, technical_confidence
         )
-        
+
+        # Generate reasoning only when the caller wants it
+        if include_reasoning:
+            reasoning = self._generate_reasoning(
+                signal_type, sentiment_score, technical_score,
+                sentiment_data, ind
+            )
+        else:
+            reasoning = ""
+
         return {
             'ticker': ticker,
             'signal_type': signal_type,
-            'confidence': float(overall_confidence),
-            'sentiment_score': float(sentiment_score),
-            'technical_score': float(technical_score),
-            'final_score': float(final_score),
+            'confidence': overall_confidence,
+            'sentiment_score': sentiment_score,
+            'technical_score': technical_score,
+            'final_score': final_score,
             'reasoning': reasoning,
-            'technical_indicators': market_data.get('indicators', {})
+            'technical_indicators': indicators
         }
-    
-    def _calculate_technical_score(self, market_data: Dict) -> float:
+
+    # Indicator columns consumed by the batched evaluator, in the same
+    # shape the per-bar indicators dict uses
+    _BATCH_FIELDS = ('RSI', 'MACD', 'MACD_signal', 'MACD_diff', 'MA_20',
+                     'MA_50', 'MA_200', 'BB_high', 'BB_low', 'BB_mid',
+                     'current_price', 'volume', 'volume_sma')
+
+    def generate_signals_batch(self, sentiment_scores: np.ndarray,
+                               sentiment_confidences: np.ndarray,
+                               indicators: Dict[str, np.ndarray],
+                               dtype=np.float64) -> Dict[str, np.ndarray]:
+        """Evaluate the strategy over whole arrays of rows at once.
+
+        Array-programming version of generate_signal for backtests and
+        multi-ticker scans: every scoring rule is applied to the full
+        column with NumPy instead of once per row through the
+        interpreter. NaN marks a missing indicator, the array analogue
+        of the None checks in the scalar path. Reasoning strings are
+        skipped by construction.
+
+        Args:
+            sentiment_scores: Weighted sentiment score per row (-1 to 1)
+            sentiment_confidences: Sentiment confidence per row (0 to 1)
+            indicators: Mapping of indicator name (see _BATCH_FIELDS) to
+                a per-row array; missing columns are treated as all-NaN
+            dtype: Floating dtype for the column math; np.float32 halves
+                memory traffic on large scans (the scoring rules have no
+                sensitivity past ~1e-3), np.float64 matches the scalar
+                path exactly
+
+        Returns:
+            Dictionary of arrays: signal_type (int8 Signal codes:
+            1 buy, -1 sell, 0 hold), confidence, sentiment_score,
+            technical_score, final_score
+        """
+        sent = np.asarray(sentiment_scores, dtype=dtype)
+        sconf = np.asarray(sentiment_confidences, dtype=dtype)
+        n_rows = sent.shape[0]
+
+        def col(name):
+            arr = indicators.get(name)
+            if arr is None:
+                return np.full(n_rows, np.nan, dtype=dtype)
+            return np.asarray(arr, dtype=dtype)
+
+        rsi = col('RSI')
+        macd = col('MACD')
+        macd_sig = col('MACD_signal')
+        macd_diff = col('MACD_diff')
+        ma20 = col('MA_20')
+        ma50 = col('MA_50')
+        ma200 = col('MA_200')
+        bb_hi = col('BB_high')
+        bb_lo = col('BB_low')
+        bb_mid = col('BB_mid')
+        price = col('current_price')
+        volume = col('volume')
+        vol_sma = col('volume_sma')
+
+        total = np.zeros(n_rows, dtype=dtype)
+        count = np.zeros(n_rows, dtype=dtype)
+
+        # RSI band score
+        has = ~np.isnan(rsi)
+        total += np.where(has,
+                          np.where(rsi < 30, 0.7,
+                                   np.where(rsi > 70, -0.7,
+                                            np.where(rsi < 50, 0.2, -0.2))),
+                          0.0)
+        count += has
+
+        # MACD crossover
+        has = ~np.isnan(macd) & ~np.isnan(macd_sig)
+        total += np.where(has, np.where(macd > macd_sig, 0.5, -0.3), 0.0)
+        count += has
+
+        # MACD histogram direction
+        has = ~np.isnan(macd_diff)
+        total += np.where(has, np.where(macd_diff > 0, 0.3, -0.3), 0.0)
+        count += has
+
+        # Moving-average alignment
+        has = ~np.isnan(ma20) & ~np.isnan(ma50) & ~np.isnan(price)
+        total += np.where(has & (price > ma20) & (ma20 > ma50), 0.6, 0.0)
+        total += np.where(has & (price < ma20) & (ma20 < ma50), -0.6, 0.0)
+        count += has
+
+        # Long-term trend
+        has = ~np.isnan(ma200) & ~np.isnan(price)
+        total += np.where(has, np.where(price > ma200, 0.2, -0.2), 0.0)
+        count += has
+
+        # Bollinger Bands (low-band test wins when both hold, matching
+        # the scalar elif)
+        has = (~np.isnan(bb_hi) & ~np.isnan(bb_lo) & ~np.isnan(bb_mid)
+               & ~np.isnan(price))
+        total += np.where(has & (price <= bb_lo), 0.5,
+                          np.where(has & (price >= bb_hi), -0.5, 0.0))
+        count += has
+
+        # Volume only contributes (and counts) when it is extreme,
+        # matching the scalar rule
+        has = ~np.isnan(volume) & ~np.isnan(vol_sma)
+        vol_hi = has & (volume > vol_sma * 1.5)
+        vol_lo = has & (volume < vol_sma * 0.5) & ~vol_hi
+        total += 0.2 * vol_hi - 0.1 * vol_lo
+        count += vol_hi | vol_lo
+
+        technical_scores = np.where(
+            count > 0, np.clip(np.divide(total, count, where=count > 0,
+                                         out=np.zeros(n_rows, dtype=dtype)),
+                               -1.0, 1.0),
+            0.0).astype(dtype, copy=False)
+
+        # Confidence from how many of the six headline indicators exist;
+        # a fully-NaN row is the batch analogue of the empty dict in the
+        # scalar path and keeps its low-confidence floor
+        available = ((~np.isnan(rsi)).astype(np.int64)
+                     + ~np.isnan(macd) + ~np.isnan(ma20) + ~np.isnan(ma50)
+                     + ~np.isnan(ma200) + ~np.isnan(bb_hi))
+        any_present = ~(np.isnan(rsi) & np.isnan(macd) & np.isnan(macd_sig)
+                        & np.isnan(macd_diff) & np.isnan(ma20) & np.isnan(ma50)
+                        & np.isnan(ma200) & np.isnan(bb_hi) & np.isnan(bb_lo)
+                        & np.isnan(bb_mid) & np.isnan(price) & np.isnan(volume)
+                        & np.isnan(vol_sma))
+        technical_confidences = np.where(
+            any_present, np.minimum(1.0, 0.4 + available / 10.0),
+            0.3).astype(dtype, copy=False)
+
+        final_scores = (self.sentiment_weight * sent
+                        + self.technical_weight * technical_scores)
+        confidences = (self.sentiment_weight * sconf
+                       + self.technical_weight * technical_confidences)
+
+        # Coded verdicts (Signal values) in one byte per row instead of
+        # an object-dtype string column
+        signal_types = ((final_scores > self.buy_threshold).astype(np.int8)
+                        - (final_scores < self.sell_threshold).astype(np.int8))
+
+        return {
+            'signal_type': signal_types,
+            'confidence': confidences,
+            'sentiment_score': sent,
+            'technical_score': technical_scores,
+            'final_score': final_scores,
+        }
+
+    def generate_signals_sweep(self, sentiment_scores: np.ndarray,
+                               sentiment_confidences: np.ndarray,
+                               indicators: Dict[str, np.ndarray],
+                               param_grid: np.ndarray,
+                               dtype=np.float32) -> np.ndarray:
+        """Evaluate a grid of strategy parameters over all bars at once.
+
+        Parameter-sweep companion to generate_signals_batch: the
+        per-bar technical score does not depend on the swept
+        parameters, so it is computed once and then combined with every
+        (sentiment_weight, technical_weight, buy_threshold,
+        sell_threshold) row as one (n_bars, n_params) elementwise map.
+        When CuPy is importable the combine runs on the GPU with the
+        panel uploaded once; otherwise the same expressions run through
+        NumPy.
+
+        Args:
+            sentiment_scores: Weighted sentiment score per bar (-1 to 1)
+            sentiment_confidences: Sentiment confidence per bar (0 to 1)
+            indicators: Column mapping or IndicatorPanel, as accepted by
+                generate_signals_batch
+            param_grid: Array of shape (n_params, 4) with rows
+                (sentiment_weight, technical_weight, buy_threshold,
+                sell_threshold); weights are normalized like __init__
+            dtype: Floating dtype for the sweep math
+
+        Returns:
+            int8 array of Signal codes with shape (n_bars, n_params)
+        """
+        batch = self.generate_signals_batch(
+            sentiment_scores, sentiment_confidences, indicators,
+            dtype=dtype)
+
+        xp = _cupy if _cupy is not None else np
+        tech = xp.asarray(batch['technical_score'])[:, None]
+        sent = xp.asarray(batch['sentiment_score'])[:, None]
+
+        grid = xp.asarray(param_grid, dtype=dtype)
+        sw, tw = grid[:, 0], grid[:, 1]
+        total = sw + tw
+        norm = xp.where(total > 0, total, 1.0)
+        sw, tw = sw / norm, tw / norm
+        buy_thr, sell_thr = grid[:, 2], grid[:, 3]
+
+        final = sent * sw[None, :] + tech * tw[None, :]
+        codes = ((final > buy_thr[None, :]).astype(xp.int8)
+                 - (final < sell_thr[None, :]).astype(xp.int8))
+        if xp is not np:
+            codes = xp.asnumpy(codes)
+        return codes
+
+    def _score_and_confidence(self, ind: Optional[Indicators]) -> tuple:
+        """Calculate technical score and confidence in one kernel pass.
+
+        The fused kernel walks the indicator row once, accumulating the
+        score and the availability count together instead of making two
+        separate passes.
+
+        Args:
+            ind: Packed indicator row (NaN = missing), or None when no
+                indicators are available
+
+        Returns:
+            Tuple of (technical score from -1 to 1, confidence from 0
+            to 1); no indicators at all means (0.0, 0.3)
+        """
+        if ind is None:
+            return 0.0, 0.3  # Low confidence if no indicators
+        return tech_eval(*ind)
+
+    def _calculate_technical_score(self, ind: Optional[Indicators]) -> float:
         """Calculate technical indicator score.
-        
+
         Args:
-            market_data: Dictionary with technical indicators
-            
+            ind: Packed indicator row (NaN = missing), or None when no
+                indicators are available
+
         Returns:
             Technical score from -1 (bearish) to 1 (bullish)
         """
-        indicators = market_data.get('indicators', {})
-        if not indicators:
-            return 0.0
-        
-        scores = []
-        
-        # RSI (Relative Strength Index)
-        rsi = indicators.get('RSI')
-        if rsi is not None:
-            if rsi < 30:  # Oversold - bullish
-                scores.append(0.7)
-            elif rsi > 70:  # Overbought - bearish
-                scores.append(-0.7)
-            elif rsi < 50:  # Below neutral - slightly bullish
-                scores.append(0.2)
-            else:  # Above neutral - slightly bearish
-                scores.append(-0.2)
-        
-        # MACD
-        macd = indicators.get('MACD')
-        macd_signal = indicators.get('MACD_signal')
-        macd_diff = indicators.get('MACD_diff')
-        
-        if macd is not None and macd_signal is not None:
-            if macd > macd_signal:  # Bullish crossover
-                scores.append(0.5)
-            else:  # Bearish
-                scores.append(-0.3)
-        
-        if macd_diff is not None:
-            if macd_diff > 0:
-                scores.append(0.3)
-            else:
-                scores.append(-0.3)
-        
-        # Moving Averages
-        ma_20 = indicators.get('MA_20')
-        ma_50 = indicators.get('MA_50')
-        ma_200 = indicators.get('MA_200')
-        current_price = indicators.get('current_price')
-        
-        if all([ma_20, ma_50, current_price]):
-            # Price above MA20 and MA20 above MA50 = bullish
-            if current_price > ma_20 > ma_50:
-                scores.append(0.6)
-            # Price below MA20 and MA20 below MA50 = bearish
-            elif current_price < ma_20 < ma_50:
-                scores.append(-0.6)
-            # Price between MAs = neutral
-            else:
-                scores.append(0.0)
-        
-        if ma_200 and current_price:
-            if current_price > ma_200:
-                scores.append(0.2)  # Above long-term trend
-            else:
-                scores.append(-0.2)  # Below long-term trend
-        
-        # Bollinger Bands
-        bb_high = indicators.get('BB_high')
-        bb_low = indicators.get('BB_low')
-        bb_mid = indicators.get('BB_mid')
-        
-        if all([bb_high, bb_low, bb_mid, current_price]):
-            if current_price <= bb_low:  # Oversold
-                scores.append(0.5)
-            elif current_price >= bb_high:  # Overbought
-                scores.append(-0.5)
-            else:
-                scores.append(0.0)
-        
-        # Volume
-        volume = indicators.get('volume')
-        volume_sma = indicators.get('volume_sma')
-        
-        if volume and volume_sma:
-            if volume > volume_sma * 1.5:  # High volume - could indicate strong move
-                scores.append(0.2)
-            elif volume < volume_sma * 0.5:  # Low volume - weak interest
-                scores.append(-0.1)
-        
-        # Average all scores and normalize to -1 to 1
-        if scores:
-            avg_score = sum(scores) / len(scores)
-            # Normalize to ensure it's between -1 and 1
-            return max(-1.0, min(1.0, avg_score))
-        
-        return 0.0
-    
-    def _calculate_technical_confidence(self, market_data: Dict) -> float:
+        return self._score_and_confidence(ind)[0]
+
+    def _calculate_technical_confidence(self, ind: Optional[Indicators]) -> float:
         """Calculate confidence in technical analysis.
-        
+
         Args:
-            market_data: Dictionary with technical indicators
-            
+            ind: Packed indicator row (NaN = missing), or None when no
+                indicators are available
+
         Returns:
             Confidence score from 0 to 1
         """
-        indicators = market_data.get('indicators', {})
-        if not indicators:
-            return 0.3  # Low confidence if no indicators
-        
-        # Count available indicators
-        available_indicators = sum([
-            1 if indicators.get('RSI') is not None else 0,
-            1 if indicators.get('MACD') is not None else 0,
-            1 if indicators.get('MA_20') is not None else 0,
-            1 if indicators.get('MA_50') is not None else 0,
-            1 if indicators.get('MA_200') is not None else 0,
-            1 if indicators.get('BB_high') is not None else 0
-        ])
-        
-        # More indicators = higher confidence (up to a point)
-        confidence = min(1.0, 0.4 + (available_indicators / 10.0))
-        return confidence
+        return self._score_and_confidence(ind)[1]
     
     def _generate_reasoning(self, signal_type: str, sentiment_score: float,
                            technical_score: float, sentiment_data: Dict,
-                           market_data: Dict) -> str:
+                           ind: Optional[Indicators]) -> str:
         """Generate human-readable reasoning for the signal.
-        
+
         Args:
             signal_type: buy, sell, or hold
             sentiment_score: Sentiment score (-1 to 1)
             technical_score: Technical score (-1 to 1)
             sentiment_data: Sentiment data dictionary
-            market_data: Market data dictionary
-            
+            ind: Packed indicator row (NaN = missing), or None
+
         Returns:
             Reasoning string
         """
         sentiment_label = sentiment_data.get('overall_sentiment', 'neutral')
         sentiment_count = sentiment_data.get('total_count', 0)
-        
+
         reasoning_parts = []
-        
+
         # Sentiment reasoning
         if sentiment_count > 0:
             reasoning_parts.append(
@@ -234,36 +460,30 @@ class SentimentTradingStrategy:
             )
         else:
             reasoning_parts.append("Limited sentiment data available")
-        
-        # Technical reasoning
-        indicators = market_data.get('indicators', {})
-        tech_reasons = []
-        
-        rsi = indicators.get('RSI')
-        if rsi:
-            if rsi < 30:
-                tech_reasons.append("RSI indicates oversold conditions")
-            elif rsi > 70:
-                tech_reasons.append("RSI indicates overbought conditions")
-        
-        macd_diff = indicators.get('MACD_diff')
-        if macd_diff:
-            if macd_diff > 0:
-                tech_reasons.append("MACD shows bullish momentum")
-            else:
-                tech_reasons.append("MACD shows bearish momentum")
-        
-        current_price = indicators.get('current_price')
-        ma_20 = indicators.get('MA_20')
-        if current_price and ma_20:
-            if current_price > ma_20:
-                tech_reasons.append("Price is above 20-day moving average")
-            else:
-                tech_reasons.append("Price is below 20-day moving average")
-        
-        if tech_reasons:
-            reasoning_parts.append("Technical indicators: " + ", ".join(tech_reasons[:3]))
-        
+
+        # Technical reasoning (NaN = missing; zero values are real
+        # data): compute a small state index and look the pre-joined
+        # sentence up in _REASON_TABLE instead of appending and joining
+        rsi_state = macd_state = ma_state = 0
+        if ind is not None:
+            rsi = ind.RSI
+            if not np.isnan(rsi):
+                if rsi < 30:
+                    rsi_state = 1
+                elif rsi > 70:
+                    rsi_state = 2
+
+            macd_diff = ind.MACD_diff
+            if not np.isnan(macd_diff):
+                macd_state = 1 if macd_diff > 0 else 2
+
+            if not np.isnan(ind.current_price) and not np.isnan(ind.MA_20):
+                ma_state = 1 if ind.current_price > ind.MA_20 else 2
+
+        tech_sentence = _REASON_TABLE[rsi_state + 3 * macd_state + 9 * ma_state]
+        if tech_sentence:
+            reasoning_parts.append(tech_sentence)
+
         # Combine reasoning
         reasoning = ". ".join(reasoning_parts)
         
@@ -281,31 +501,117 @@ class SentimentTradingStrategy:
                                volatility: Optional[float] = None,
                                risk_per_trade: float = 0.02) -> float:
         """Calculate position size based on confidence and risk.
-        
+
         Args:
             capital: Available capital
             signal_confidence: Confidence in the signal (0-1)
             volatility: Optional volatility measure (standard deviation)
             risk_per_trade: Percentage of capital to risk per trade (default 2%)
-            
+
         Returns:
             Position size in dollars
         """
-        # Base position size on risk percentage
-        base_position = capital * risk_per_trade
-        
-        # Adjust based on confidence
-        # Higher confidence = larger position (up to 2x base)
-        position_multiplier = 0.5 + (signal_confidence * 1.5)
-        position_multiplier = min(2.0, max(0.5, position_multiplier))
-        
-        position_size = base_position * position_multiplier
-        
-        # Adjust for volatility if provided
-        if volatility:
-            # Higher volatility = smaller position
-            volatility_adjustment = 1.0 / (1.0 + volatility)
-            position_size *= volatility_adjustment
-        
-        return position_size
+        sizes = self.calculate_position_sizes(
+            np.array([capital]), np.array([signal_confidence]),
+            None if volatility is None else np.array([volatility]),
+            risk_per_trade)
+        return float(sizes[0])
+
+    def calculate_position_sizes(self, capitals: np.ndarray,
+                                 signal_confidences: np.ndarray,
+                                 volatilities: Optional[np.ndarray] = None,
+                                 risk_per_trade: float = 0.02) -> np.ndarray:
+        """Calculate position sizes for a batch of candidate trades.
+
+        Vectorized counterpart of calculate_position_size for portfolio
+        construction: sizes N candidates in three NumPy ops instead of
+        N Python calls.
+
+        Args:
+            capitals: Available capital per candidate
+            signal_confidences: Signal confidence per candidate (0-1)
+            volatilities: Optional volatility per candidate; NaN or
+                non-positive entries mean no adjustment, matching the
+                scalar truthiness check
+            risk_per_trade: Percentage of capital to risk per trade (default 2%)
+
+        Returns:
+            Array of position sizes in dollars
+        """
+        capitals = np.asarray(capitals, dtype=np.float64)
+        signal_confidences = np.asarray(signal_confidences, dtype=np.float64)
+
+        # Base position scaled by confidence (0.5x to 2x base)
+        multipliers = np.clip(0.5 + signal_confidences * 1.5, 0.5, 2.0)
+        position_sizes = capitals * risk_per_trade * multipliers
+
+        # Adjust for volatility where provided
+        if volatilities is not None:
+            vol = np.asarray(volatilities, dtype=np.float64)
+            has_vol = ~np.isnan(vol) & (vol != 0.0)
+            position_sizes *= np.where(has_vol, 1.0 / (1.0 + vol), 1.0)
+
+        return position_sizes
+
+
+class IndicatorPanel:
+    """Structure-of-arrays panel of indicator time series.
+
+    Holds one contiguous array per indicator field instead of one dict
+    per bar, so scanning an indicator across bars is a linear stream
+    the prefetcher can follow. A panel drops straight into
+    generate_signals_batch because it exposes the same get() the plain
+    column-dict path uses.
+    """
+
+    _FIELDS = SentimentTradingStrategy._BATCH_FIELDS
+
+    def __init__(self, columns: Dict[str, np.ndarray], dtype=np.float32):
+        """Initialize the panel from existing columns.
+
+        Args:
+            columns: Mapping of indicator name (see _FIELDS) to a
+                per-bar array; missing fields read as None
+            dtype: Storage dtype for the columns (default float32 to
+                halve memory traffic on large scans)
+        """
+        self._columns = {
+            name: np.ascontiguousarray(arr, dtype=dtype)
+            for name, arr in columns.items() if name in self._FIELDS
+        }
+
+    @classmethod
+    def from_bars(cls, bars: List[Dict], dtype=np.float32) -> 'IndicatorPanel':
+        """Build a panel from per-bar indicator dicts in one pass.
+
+        Args:
+            bars: List of indicator dicts, one per bar; None or absent
+                values become NaN
+            dtype: Storage dtype for the columns
+
+        Returns:
+            IndicatorPanel with len(bars) rows per field
+        """
+        n_bars = len(bars)
+        columns = {name: np.full(n_bars, np.nan, dtype=dtype)
+                   for name in cls._FIELDS}
+        for i, bar in enumerate(bars):
+            get = bar.get
+            for name, arr in columns.items():
+                value = get(name)
+                if value is not None:
+                    arr[i] = value
+        return cls(columns, dtype=dtype)
+
+    def get(self, name: str) -> Optional[np.ndarray]:
+        """Return the column for an indicator, or None if absent."""
+        return self._columns.get(name)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        for arr in self._columns.values():
+            return arr.shape[0]
+        return 0
 